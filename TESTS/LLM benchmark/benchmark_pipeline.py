@@ -0,0 +1,289 @@
+import re
+import os
+import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from ollama_benchmark import test_model, parse_stats_records
+from qualityAssessment import parse_input_prompts, parse_stats_file, assess_quality, write_report
+
+# --- Configuration ---
+# Display name -> (Ollama model name, stats file). Add a model here and only its stages run.
+PIPELINE_MODELS = {
+    "Qwen-1.5B": ("testqwencoach", "qwencoachstats.txt"),
+    "Llama3.2-3B-Q4_S": ("test3bscoach", "3bscoachstats.txt"),
+    "Llama3.2-3B-Q4_M": ("newsum3bmcoach", "3bmcoachstats.txt"),
+    "Phi-3.5-3.8B": ("testphicoach", "phicoachstats.txt"),
+}
+INPUT_FILE = "100SquateInputPrompt.txt"
+QUALITY_REPORT_FILE = "quality_assessment_results.txt"
+LATENCY_GRAPH_DIR = "latency_graphs"
+QUALITY_GRAPH_DIR = "quality_graphs"
+OLLAMA_URL = "http://localhost:11434/api/chat"
+# Display name -> URL for models served elsewhere. Benchmark runs on the same URL never overlap,
+# so queueing and model swaps on a shared server do not end up in the measured latencies.
+MODEL_URLS = {}
+
+CACHE_DIR = "pipeline_cache"            # intermediate per-model assessment results
+MANIFEST_FILE = os.path.join(CACHE_DIR, "manifest.json")
+# Independent stages executed at once (assessments, and benchmark runs on different servers)
+MAX_PARALLEL_STAGES = 2
+# Treat stats files that already exist but were never recorded as up to date instead of re-running the model
+ADOPT_EXISTING_OUTPUTS = True
+# Stage names to re-run regardless of their cache state, e.g. ["run:Phi-3.5-3.8B"]
+FORCE_STAGES = []
+
+
+def file_hash(filepath):
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    if not os.path.exists(filepath):
+        return None
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Stage:
+    """
+    One step of the pipeline. A stage is up to date when the hash of its parameters and
+    input file contents matches the last successful run and its outputs are unchanged.
+    """
+
+    def __init__(self, name, action, inputs=(), outputs=(), deps=(), params=None,
+                 exclusive=False, adoptable=False, check=None, resource=None):
+        self.name = name
+        self.action = action
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.params = params or {}
+        self.exclusive = exclusive      # run on the main thread, one at a time (matplotlib is not thread-safe)
+        self.adoptable = adoptable
+        self.check = check              # returns True if existing outputs are usable, checked before adopting them
+        self.resource = resource        # stages sharing a resource never run at the same time
+
+    def input_hash(self):
+        digest = hashlib.sha256(json.dumps({"stage": self.name, "params": self.params}, sort_keys=True).encode('utf-8'))
+        for path in sorted(self.inputs):
+            digest.update(f"{path}:{file_hash(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def output_hashes(self):
+        return {path: file_hash(path) for path in self.outputs}
+
+
+def slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "_", name).strip("_")
+
+
+def assessment_path(display_name):
+    return os.path.join(CACHE_DIR, f"assess_{slug(display_name)}.json")
+
+
+def has_successful_reply(stats_file):
+    """True if the stats file holds at least one decoded Ollama reply rather than only errors."""
+    return any(record["reply"] is not None for record in parse_stats_records(stats_file))
+
+
+def run_model(model_name, stats_file, ollama_url):
+    """Benchmarks one model; fails if every request errored so the stage is retried next time."""
+    test_model(model_name, stats_file, ollama_url)
+    if not has_successful_reply(stats_file):
+        raise RuntimeError(f"no successful replies in '{stats_file}' (is Ollama running at {ollama_url}?)")
+
+
+def assess_model(display_name, stats_file):
+    """Scores one model's stats file and stores the per-prompt results as JSON."""
+    ground_truths = parse_input_prompts(INPUT_FILE)
+    results = assess_quality(display_name, ground_truths, parse_stats_file(stats_file))
+    with open(assessment_path(display_name), 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+
+
+def write_quality_report():
+    """Merges the per-model assessments into quality_assessment_results.txt."""
+    model_results = {}
+    for display_name in PIPELINE_MODELS:
+        with open(assessment_path(display_name), 'r', encoding='utf-8') as f:
+            model_results[display_name] = json.load(f)
+    write_report(model_results, QUALITY_REPORT_FILE)
+
+
+def plot_latency():
+    # Imported here so the rest of the pipeline works without pandas/matplotlib/seaborn installed
+    from graphgen import create_graphs
+    create_graphs({name: stats_file for name, (_, stats_file) in PIPELINE_MODELS.items()}, LATENCY_GRAPH_DIR)
+
+
+def plot_quality():
+    from qualitytgraphgen import create_quality_graphs
+    create_quality_graphs(QUALITY_REPORT_FILE, QUALITY_GRAPH_DIR)
+
+
+def build_stages():
+    """Models run -> assess -> report/plot as a dependency graph."""
+    stages = []
+    for display_name, (model_name, stats_file) in PIPELINE_MODELS.items():
+        ollama_url = MODEL_URLS.get(display_name, OLLAMA_URL)
+        stages.append(Stage(
+            f"run:{display_name}",
+            lambda model_name=model_name, stats_file=stats_file, ollama_url=ollama_url:
+                run_model(model_name, stats_file, ollama_url),
+            inputs=[INPUT_FILE, "ollama_benchmark.py"],
+            outputs=[stats_file],
+            params={"model": model_name},
+            adoptable=True,
+            check=lambda stats_file=stats_file: has_successful_reply(stats_file),
+            resource=ollama_url
+        ))
+        stages.append(Stage(
+            f"assess:{display_name}",
+            lambda display_name=display_name, stats_file=stats_file: assess_model(display_name, stats_file),
+            inputs=[INPUT_FILE, stats_file, "qualityAssessment.py"],
+            outputs=[assessment_path(display_name)],
+            deps=[f"run:{display_name}"]
+        ))
+
+    stages.append(Stage(
+        "report:quality",
+        write_quality_report,
+        inputs=[assessment_path(name) for name in PIPELINE_MODELS] + ["qualityAssessment.py"],
+        outputs=[QUALITY_REPORT_FILE],
+        deps=[f"assess:{name}" for name in PIPELINE_MODELS],
+        params={"models": list(PIPELINE_MODELS)}
+    ))
+    stages.append(Stage(
+        "plot:latency",
+        plot_latency,
+        inputs=[stats_file for _, stats_file in PIPELINE_MODELS.values()] + ["graphgen.py"],
+        outputs=[os.path.join(LATENCY_GRAPH_DIR, name) for name in (
+            "1_average_performance_bar_chart.svg",
+            "2_response_time_distribution_box_plot.png",
+            "3_performance_profile_scatter_plot.png")],
+        deps=[f"run:{name}" for name in PIPELINE_MODELS],
+        params={"models": {name: stats_file for name, (_, stats_file) in PIPELINE_MODELS.items()}},
+        exclusive=True
+    ))
+    stages.append(Stage(
+        "plot:quality",
+        plot_quality,
+        inputs=[QUALITY_REPORT_FILE, "qualitytgraphgen.py"],
+        outputs=[os.path.join(QUALITY_GRAPH_DIR, name) for name in (
+            "1_average_quality_score.svg",
+            "2_criterion_pass_rate_heatmap.svg")],
+        deps=["report:quality"],
+        exclusive=True
+    ))
+    return stages
+
+
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        print(f"Warning: Could not read '{MANIFEST_FILE}'; every stage will run.")
+        return {}
+
+
+def save_manifest(manifest):
+    with open(MANIFEST_FILE + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(MANIFEST_FILE + ".tmp", MANIFEST_FILE)
+
+
+def is_up_to_date(stage, current_hash, manifest):
+    """Checks the manifest; may adopt existing outputs of a never-recorded adoptable stage."""
+    if stage.name in FORCE_STAGES:
+        return False
+    record = manifest.get(stage.name)
+    outputs = stage.output_hashes()
+    if record is None:
+        if (ADOPT_EXISTING_OUTPUTS and stage.adoptable and all(outputs.values())
+                and (stage.check is None or stage.check())):
+            manifest[stage.name] = {"input_hash": current_hash, "outputs": outputs}
+            print(f"[adopted]  {stage.name} (existing outputs recorded as up to date)")
+            return True
+        return False
+    return record["input_hash"] == current_hash and record["outputs"] == outputs and all(outputs.values())
+
+
+def run_pipeline(stages):
+    """Runs stale stages in dependency order, independent ones in parallel. Returns (ran, skipped, failed)."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    manifest = load_manifest()
+    pending = {stage.name: stage for stage in stages}
+    done, ran, skipped, failed = set(), [], [], []
+    running = {}
+    busy = set()        # resources held by running stages
+
+    def finish(stage, current_hash):
+        manifest[stage.name] = {"input_hash": current_hash, "outputs": stage.output_hashes()}
+        save_manifest(manifest)
+        done.add(stage.name)
+        ran.append(stage.name)
+        print(f"[done]     {stage.name}")
+
+    with ThreadPoolExecutor(max_workers=MAX_PARALLEL_STAGES) as pool:
+        while pending or running:
+            progressed = True
+            while progressed:
+                progressed = False
+                for stage in [s for s in pending.values() if all(d in done for d in s.deps)]:
+                    # Hash inputs only now, after every dependency has written its outputs
+                    current_hash = stage.input_hash()
+                    if is_up_to_date(stage, current_hash, manifest):
+                        del pending[stage.name]
+                        progressed = True
+                        done.add(stage.name)
+                        skipped.append(stage.name)
+                        print(f"[cached]   {stage.name}")
+                        continue
+                    if stage.resource is not None and stage.resource in busy:
+                        continue  # started once the stage holding the resource finishes
+                    del pending[stage.name]
+                    progressed = True
+                    if stage.exclusive:
+                        print(f"[running]  {stage.name}")
+                        try:
+                            stage.action()
+                            finish(stage, current_hash)
+                        except Exception as e:
+                            print(f"[FAILED]   {stage.name}: {e}")
+                            failed.append(stage.name)
+                    else:
+                        print(f"[running]  {stage.name}")
+                        if stage.resource is not None:
+                            busy.add(stage.resource)
+                        running[pool.submit(stage.action)] = (stage, current_hash)
+
+            if not running:
+                break  # anything still pending depends on a failed stage
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage, current_hash = running.pop(future)
+                busy.discard(stage.resource)
+                try:
+                    future.result()
+                    finish(stage, current_hash)
+                except Exception as e:
+                    print(f"[FAILED]   {stage.name}: {e}")
+                    failed.append(stage.name)
+
+    save_manifest(manifest)
+    for name in pending:
+        print(f"[blocked]  {name}")
+    return ran, skipped, failed
+
+
+def main():
+    ran, skipped, failed = run_pipeline(build_stages())
+    print(f"\nPipeline finished: {len(ran)} stages ran, {len(skipped)} up to date, {len(failed)} failed.")
+
+if __name__ == "__main__":
+    main()
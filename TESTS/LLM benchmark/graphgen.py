@@ -40,17 +40,17 @@ def parse_stats_file(filepath):
         
     return results
 
-def create_graphs():
+def create_graphs(stats_files=STATS_FILES, output_dir=OUTPUT_DIR):
     """Main function to load all data and generate the plots."""
     all_data = []
     
     # Check if output directory exists
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        print(f"Created directory: {OUTPUT_DIR}")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Created directory: {output_dir}")
 
     # Load data from all files
-    for model_name, filename in STATS_FILES.items():
+    for model_name, filename in stats_files.items():
         model_results = parse_stats_file(filename)
         for result in model_results:
             result['model'] = model_name
@@ -97,7 +97,7 @@ def create_graphs():
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax2.legend(lines + lines2, labels + labels2, loc='upper left')
     
-    plt.savefig(os.path.join(OUTPUT_DIR, "1_average_performance_bar_chart.svg"))
+    plt.savefig(os.path.join(output_dir, "1_average_performance_bar_chart.svg"))
     print("Saved: 1_average_performance_bar_chart.png")
     plt.close(fig1)
 
@@ -111,7 +111,7 @@ def create_graphs():
     ax.grid(True, which='both', linestyle='--', linewidth=0.5)
     plt.tight_layout()
     
-    plt.savefig(os.path.join(OUTPUT_DIR, "2_response_time_distribution_box_plot.png"))
+    plt.savefig(os.path.join(output_dir, "2_response_time_distribution_box_plot.png"))
     print("Saved: 2_response_time_distribution_box_plot.png")
     plt.close(fig2)
 
@@ -135,7 +135,7 @@ def create_graphs():
     ax.grid(True, which='both', linestyle='--', linewidth=0.5)
     plt.tight_layout()
 
-    plt.savefig(os.path.join(OUTPUT_DIR, "3_performance_profile_scatter_plot.png"))
+    plt.savefig(os.path.join(output_dir, "3_performance_profile_scatter_plot.png"))
     print("Saved: 3_performance_profile_scatter_plot.png")
     plt.close(fig3)
 
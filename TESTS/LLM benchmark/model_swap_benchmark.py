@@ -0,0 +1,235 @@
+import requests
+import re
+import json
+import time
+import random
+
+from ollama_benchmark import parse_prompts, construct_full_prompt, build_payload
+from sharded_benchmark import percentile
+
+# --- Configuration ---
+OLLAMA_BASE_URL = "http://localhost:11434"
+INPUT_FILE = "100SquateInputPrompt.txt"
+OUTPUT_FILE = "model_swap_stats.txt"
+REQUEST_TIMEOUT_S = 150
+
+# Coach personalities as selected in MenuPage.xaml.cs, with the temperatures from OllamaClient.cs
+COACH_MODELS = {
+    "newsum3bmcoach": 0.05,
+    "friendly3bmcoach": 0.5,
+    "strict3bmcoach": 0.2,
+}
+# Persona reminders prepended by SquatRecognizer.BuildSummarizationPrompt
+PERSONA_PREFIXES = {
+    "friendly3bmcoach": "REMEMBER: Your persona is a friendly, funny, and sarcastic coach. Your response must reflect this personality.\n",
+    "strict3bmcoach": "REMEMBER: Your persona is a strict Drill Sergeant addressing a recruit. Your response must reflect this personality.\n",
+}
+# How often each personality is picked for a new session
+PERSONALITY_WEIGHTS = {
+    "newsum3bmcoach": 0.6,
+    "friendly3bmcoach": 0.25,
+    "strict3bmcoach": 0.15,
+}
+
+# Scenario: a station serving successive users, each picking a coach and doing a set of reps
+NUM_SESSIONS = 12
+REPS_PER_SESSION = (3, 8)   # inclusive range
+REP_GAP_S = 2.0             # time between reps within a session
+SESSION_GAP_S = 20.0        # menu / setup time between sessions
+SCENARIO_SEED = 4713
+# A rep counts as a cold start when Ollama reports a load_duration above this (warm loads are ~0.07 s)
+COLD_LOAD_THRESHOLD_S = 0.5
+
+KEEP_ALIVE_VALUES = [0, "30s", "5m", -1]
+# none:         load on first use
+# preload_all:  load every coach once before the scenario starts
+# on_select:    load the coach as soon as it is selected, during the session gap
+# Preloading is skipped for keep_alive 0: a load request with keep_alive 0 unloads the model again at once
+PRELOAD_STRATEGIES = ["none", "preload_all", "on_select"]
+
+# Set to True to run against a local stand-in server instead of a real Ollama instance
+USE_STUB_SERVERS = False
+STUB_PORT = 11501
+
+
+def build_scenario():
+    """Returns the list of (model, reps) sessions replayed for every configuration."""
+    rng = random.Random(SCENARIO_SEED)
+    models = list(PERSONALITY_WEIGHTS.keys())
+    weights = list(PERSONALITY_WEIGHTS.values())
+    return [(rng.choices(models, weights)[0], rng.randint(*REPS_PER_SESSION)) for _ in range(NUM_SESSIONS)]
+
+
+def unloads_immediately(keep_alive):
+    """True for keep_alive values of zero (0, "0", "0s", "0m", ...), which unload a model right after a request."""
+    if isinstance(keep_alive, (int, float)):
+        return keep_alive == 0
+    return re.fullmatch(r"0+(\.0*)?[smh]?", str(keep_alive).strip()) is not None
+
+
+def load_model(model, keep_alive):
+    """Asks Ollama to load a model without generating. Returns (wall time, load_duration) in seconds."""
+    payload = {"model": model, "keep_alive": keep_alive}
+    start_time = time.perf_counter()
+    response = requests.post(f"{OLLAMA_BASE_URL}/api/generate", json=payload, timeout=REQUEST_TIMEOUT_S)
+    elapsed = time.perf_counter() - start_time
+    response.raise_for_status()
+    return elapsed, response.json().get("load_duration", 0) / 1e9
+
+
+def unload_all_models():
+    """Unloads every coach model so each configuration starts cold."""
+    for model in COACH_MODELS:
+        try:
+            requests.post(f"{OLLAMA_BASE_URL}/api/generate", json={"model": model, "keep_alive": 0}, timeout=REQUEST_TIMEOUT_S)
+        except requests.exceptions.RequestException as e:
+            print(f"Warning: Could not unload '{model}': {e}")
+
+
+def resident_bytes():
+    """Returns the total size of models currently loaded according to /api/ps."""
+    try:
+        response = requests.get(f"{OLLAMA_BASE_URL}/api/ps", timeout=10)
+        response.raise_for_status()
+        return sum(m.get("size", 0) for m in response.json().get("models", []))
+    except (requests.exceptions.RequestException, json.JSONDecodeError):
+        return 0
+
+
+def run_configuration(scenario, full_prompts, keep_alive, strategy):
+    """Replays the scenario once with the given keep_alive and preload strategy."""
+    unload_all_models()
+    url = f"{OLLAMA_BASE_URL}/api/chat"
+    preload_time = 0.0
+    first_latencies = []
+    steady_latencies = []
+    load_durations = []
+    memory_samples = []
+    errors = 0
+    prompt_index = 0
+
+    def preload(model):
+        # A failed preload is counted like a failed rep; the rep itself then pays for the load
+        nonlocal preload_time, errors
+        try:
+            elapsed, _ = load_model(model, keep_alive)
+            preload_time += elapsed
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"--- ERROR preloading {model}: {e}")
+            errors += 1
+
+    if strategy == "preload_all":
+        for model in COACH_MODELS:
+            preload(model)
+
+    # Last model that answered; the first successful response of a different model counts as after a swap
+    previous_model = None
+    for session_num, (model, reps) in enumerate(scenario):
+        if session_num > 0:
+            time.sleep(SESSION_GAP_S)
+        if strategy == "on_select":
+            # The load overlaps the user's setup time, so it is reported but not added to rep latency
+            preload(model)
+
+        for rep in range(reps):
+            if rep > 0:
+                time.sleep(REP_GAP_S)
+            full_prompt = PERSONA_PREFIXES.get(model, "") + full_prompts[prompt_index % len(full_prompts)]
+            prompt_index += 1
+            payload = build_payload(model, full_prompt, temperature=COACH_MODELS[model], keep_alive=keep_alive)
+
+            try:
+                start_time = time.perf_counter()
+                response = requests.post(url, json=payload, timeout=REQUEST_TIMEOUT_S)
+                latency = time.perf_counter() - start_time
+                response.raise_for_status()
+                load_durations.append(response.json().get("load_duration", 0) / 1e9)
+            except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                print(f"--- ERROR in session {session_num + 1} rep {rep + 1} ({model}): {e}")
+                errors += 1
+                continue
+
+            if model != previous_model:
+                first_latencies.append(latency)
+                previous_model = model
+            else:
+                steady_latencies.append(latency)
+            memory_samples.append(resident_bytes())
+
+    def mean(values):
+        return sum(values) / len(values) if values else 0
+
+    return {
+        "keep_alive": keep_alive,
+        "strategy": strategy,
+        "errors": errors,
+        "preload_time_s": preload_time,
+        "cold_loads": sum(1 for d in load_durations if d > COLD_LOAD_THRESHOLD_S),
+        "total_load_s": sum(load_durations),
+        "first_mean_s": mean(first_latencies),
+        "first_p95_s": percentile(first_latencies, 95),
+        "steady_mean_s": mean(steady_latencies),
+        "steady_p95_s": percentile(steady_latencies, 95),
+        "peak_resident_gb": max(memory_samples, default=0) / 1e9,
+        "mean_resident_gb": mean(memory_samples) / 1e9
+    }
+
+
+def run_swap_benchmark():
+    """Runs every keep_alive x preload strategy combination and writes the comparison."""
+    prompts = parse_prompts(INPUT_FILE)
+    full_prompts = [p for p in (construct_full_prompt(block)[0] for block in prompts) if p]
+    if not full_prompts:
+        return
+
+    scenario = build_scenario()
+    switches = sum(1 for i in range(1, len(scenario)) if scenario[i][0] != scenario[i - 1][0])
+    print(f"Scenario: {len(scenario)} sessions, {sum(r for _, r in scenario)} reps, {switches} personality switches.")
+
+    results = []
+    skipped = []
+    for keep_alive in KEEP_ALIVE_VALUES:
+        for strategy in PRELOAD_STRATEGIES:
+            if strategy != "none" and unloads_immediately(keep_alive):
+                skipped.append((keep_alive, strategy))
+                continue
+            print(f"Running keep_alive={keep_alive!r}, preload={strategy}...")
+            results.append(run_configuration(scenario, full_prompts, keep_alive, strategy))
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write("--- Model Swap / Cold-Start Benchmark ---\n\n")
+        f.write("Scenario: " + ", ".join(f"{model} x{reps}" for model, reps in scenario) + "\n")
+        f.write(f"Rep Gap: {REP_GAP_S} s, Session Gap: {SESSION_GAP_S} s\n\n")
+
+        for r in results:
+            f.write(f"--- keep_alive={r['keep_alive']!r}, preload={r['strategy']} ---\n")
+            f.write(f"Errors: {r['errors']}\n")
+            f.write(f"Cold Loads During Reps: {r['cold_loads']} (Total load_duration: {r['total_load_s']:.4f} s)\n")
+            f.write(f"Preload Time (outside reps): {r['preload_time_s']:.4f} s\n")
+            f.write(f"First Response After Swap: mean {r['first_mean_s']:.4f} s, p95 {r['first_p95_s']:.4f} s\n")
+            f.write(f"Steady-State Response: mean {r['steady_mean_s']:.4f} s, p95 {r['steady_p95_s']:.4f} s\n")
+            f.write(f"Resident Model Memory: peak {r['peak_resident_gb']:.2f} GB, mean {r['mean_resident_gb']:.2f} GB\n\n")
+
+        for keep_alive, strategy in skipped:
+            f.write(f"--- keep_alive={keep_alive!r}, preload={strategy} ---\n")
+            f.write("Not applicable: a preload with keep_alive 0 unloads the model immediately.\n\n")
+
+        f.write("--- Ranked by First Response After Swap ---\n")
+        for r in sorted(results, key=lambda r: (r['first_mean_s'], r['mean_resident_gb'])):
+            f.write(f"keep_alive={r['keep_alive']!r}, preload={r['strategy']}: "
+                    f"{r['first_mean_s']:.4f} s, {r['mean_resident_gb']:.2f} GB mean resident\n")
+
+    print(f"\nModel swap benchmark complete. Results saved to '{OUTPUT_FILE}'.")
+
+
+if __name__ == "__main__":
+    if USE_STUB_SERVERS:
+        from stub_ollama_server import start_stub_servers, stop_stub_servers
+        stub_servers = start_stub_servers([STUB_PORT])
+        OLLAMA_BASE_URL = f"http://127.0.0.1:{STUB_PORT}"
+        try:
+            run_swap_benchmark()
+        finally:
+            stop_stub_servers(stub_servers)
+    else:
+        run_swap_benchmark()
@@ -2,6 +2,7 @@ import requests
 import json
 import time
 import os
+import re
 
 # --- Configuration ---
 MODEL_NAME = "testqwencoach"
@@ -26,25 +27,37 @@ def parse_prompts(filename):
     prompt_blocks = content.strip().split('\n\n')
     return prompt_blocks
 
-def construct_full_prompt(prompt_block):
+def parse_prompt_block(prompt_block):
     """
-    Constructs the full prompt string that mimics the C# SquatRecognizer logic.
+    Splits one prompt block into its decoded JSON summary, the raw JSON line and
+    the issue paragraph. Returns None if the block is invalid.
     """
     lines = prompt_block.strip().split('\n')
     if len(lines) < 2:
-        return None, None # Invalid block
+        return None # Invalid block
 
     json_line = lines[0]
     issue_paragraph = "\n".join(lines[1:]) # Rejoin if paragraph has multiple lines
 
     try:
         summary_data = json.loads(json_line)
-        squat_type = summary_data.get("squatType", "squat")
-        bottom_bias = summary_data.get("bottomBias", "neutral bias")
     except json.JSONDecodeError:
         print(f"Warning: Could not parse JSON line: {json_line}")
+        return None
+    return summary_data, json_line, issue_paragraph
+
+def construct_full_prompt(prompt_block):
+    """
+    Constructs the full prompt string that mimics the C# SquatRecognizer logic.
+    """
+    parsed = parse_prompt_block(prompt_block)
+    if parsed is None:
         return None, None
 
+    summary_data, json_line, issue_paragraph = parsed
+    squat_type = summary_data.get("squatType", "squat")
+    bottom_bias = summary_data.get("bottomBias", "neutral bias")
+
     # This structure is based on BuildSummarizationPrompt in SquatRecognizer.cs
     expected_first_sentence = f"{squat_type} with {bottom_bias}."
     
@@ -63,10 +76,67 @@ def construct_full_prompt(prompt_block):
     return full_prompt, prompt_block
 
 
-def test_model():
+def build_payload(model_name, full_prompt, temperature=0.05, keep_alive=None):
+    """
+    Builds the /api/chat request body with the same sampling options as OllamaClient.cs.
+    keep_alive is only sent when given, so the server default applies otherwise.
+    """
+    payload = {
+        "model": model_name,
+        "messages": [{"role": "user", "content": full_prompt}],
+        "stream": False,
+        "options": {
+            "temperature": temperature,
+            "top_p": 0.9,
+            "num_predict": 140,
+            "repeat_penalty": 1.1
+        }
+    }
+    if keep_alive is not None:
+        payload["keep_alive"] = keep_alive
+    return payload
+
+
+def parse_stats_records(filename):
+    """
+    Parses a stats file written by test_model() back into per-prompt records.
+    Each record holds the prompt number, the measured timings and the decoded
+    Ollama reply (None if the reply was an error or not valid JSON).
+    """
+    if not os.path.exists(filename):
+        print(f"Error: Stats file '{filename}' not found.")
+        return []
+
+    with open(filename, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    blocks = re.findall(
+        r"--- Prompt #(\d+) ---\n"
+        r"Response Time: ([\d.]+) seconds\n"
+        r"Tokens per Second: ([\d.]+)\n"
+        r"Raw LLM Reply \(JSON\):\n(.*?)\n\n-{10,}",
+        content, re.DOTALL
+    )
+
+    records = []
+    for prompt_num, response_time, tokens_ps, raw_reply in blocks:
+        try:
+            reply_data = json.loads(raw_reply)
+        except json.JSONDecodeError:
+            reply_data = None
+        records.append({
+            "prompt_num": int(prompt_num),
+            "response_time_s": float(response_time),
+            "tokens_per_second": float(tokens_ps),
+            "reply": reply_data
+        })
+    return records
+
+
+def test_model(model_name=MODEL_NAME, output_file=OUTPUT_FILE, ollama_url=OLLAMA_URL):
     """
     Main function to run the benchmark. It reads prompts, sends them to the Ollama API,
-    and records the results.
+    and records the results. Defaults come from the configuration above.
     """
     prompts = parse_prompts(INPUT_FILE)
     if not prompts:
@@ -76,7 +146,7 @@ def test_model():
     total_response_time = 0
     total_tokens_per_second = 0
 
-    print(f"Starting benchmark for model '{MODEL_NAME}' with {len(prompts)} prompts...")
+    print(f"Starting benchmark for model '{model_name}' with {len(prompts)} prompts...")
 
     for i, prompt_block in enumerate(prompts):
         full_prompt, original_block = construct_full_prompt(prompt_block)
@@ -85,21 +155,11 @@ def test_model():
 
         print(f"Processing prompt {i + 1}/{len(prompts)}...")
 
-        payload = {
-            "model": MODEL_NAME,
-            "messages": [{"role": "user", "content": full_prompt}],
-            "stream": False,
-            "options": {
-                "temperature": 0.05,
-                "top_p": 0.9,
-                "num_predict": 140,
-                "repeat_penalty": 1.1
-            }
-        }
+        payload = build_payload(model_name, full_prompt)
 
         try:
             start_time = time.perf_counter()
-            response = requests.post(OLLAMA_URL, json=payload, timeout=150) # 150s timeout
+            response = requests.post(ollama_url, json=payload, timeout=150) # 150s timeout
             end_time = time.perf_counter()
 
             response.raise_for_status()  # Raise an exception for bad status codes (4xx or 5xx)
@@ -147,8 +207,8 @@ def test_model():
 
 
     # Write results to file
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        f.write(f"--- Performance Stats for Model: {MODEL_NAME} ---\n\n")
+    with open(output_file, 'w', encoding='utf-8') as f:
+        f.write(f"--- Performance Stats for Model: {model_name} ---\n\n")
         
         for result in results:
             f.write(f"--- Prompt #{result['prompt_num']} ---\n")
@@ -171,7 +231,7 @@ def test_model():
             f.write(f"Average Tokens per Second: {avg_tokens_per_second:.2f}\n")
             f.write("------------------------\n")
 
-    print(f"\nBenchmark complete. Results saved to '{OUTPUT_FILE}'.")
+    print(f"\nBenchmark complete. Results saved to '{output_file}'.")
 
 if __name__ == "__main__":
     test_model()
\ No newline at end of file
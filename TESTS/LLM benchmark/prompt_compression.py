@@ -0,0 +1,204 @@
+import requests
+import json
+import time
+
+from ollama_benchmark import parse_prompts, parse_prompt_block, construct_full_prompt, build_payload
+from qualityAssessment import score_reply
+
+# --- Configuration ---
+MODEL_NAME = "newsum3bmcoach"
+INPUT_FILE = "100SquateInputPrompt.txt"
+OUTPUT_FILE = "prompt_compression_results.txt"
+OLLAMA_URL = "http://localhost:11434/api/chat"
+REQUEST_TIMEOUT_S = 150
+# A variant keeps quality if its average score is at most this far below the baseline's
+QUALITY_TOLERANCE = 0.10
+
+# Set to True to run against a local stand-in server instead of a real Ollama instance
+USE_STUB_SERVERS = False
+STUB_PORT = 11501
+
+
+# --- Prompt Variants ---
+# Each builder takes the parsed prompt block and returns the full prompt text.
+# Variants only change the instruction block and JSON; the issue paragraph is always sent as is.
+
+def first_sentence(summary_data):
+    """The required sentence 1, built the same way as construct_full_prompt()."""
+    return f"{summary_data.get('squatType', 'squat')} with {summary_data.get('bottomBias', 'neutral bias')}."
+
+
+def baseline_prompt(summary_data, json_line, issue_paragraph):
+    """The current prompt from construct_full_prompt() / SquatRecognizer.cs."""
+    return construct_full_prompt(f"{json_line}\n{issue_paragraph}")[0]
+
+
+def short_rules_prompt(summary_data, json_line, issue_paragraph):
+    """Same five rules, phrased as briefly as possible."""
+    expected_first_sentence = first_sentence(summary_data)
+    return (
+        "Summarize this squat analysis as a coach.\n"
+        "Rules:\n"
+        f"1. Sentence 1 exactly: {expected_first_sentence}\n"
+        "2. Then 1-2 sentences on the main issues, using only the paragraph's facts.\n"
+        "3. If no issues, praise consistent technique.\n"
+        "4. Max 3 sentences, end with <END>.\n"
+        "5. No new details, phase lists or instructions.\n\n"
+        "JSON:\n"
+        f"{json_line}\n\n"
+        f"{issue_paragraph}"
+    )
+
+
+def compact_json_prompt(summary_data, json_line, issue_paragraph):
+    """Baseline rules with a short-keyed JSON that drops maxDepthCm, which no rule uses."""
+    compact_json = json.dumps(
+        {"type": summary_data.get("squatType", "squat"), "bias": summary_data.get("bottomBias", "neutral bias")},
+        separators=(',', ':')
+    )
+    return baseline_prompt(summary_data, json_line, issue_paragraph).replace(json_line, compact_json)
+
+
+def no_redundancy_prompt(summary_data, json_line, issue_paragraph):
+    """
+    Drops constraints that repeat each other: rule 5's "do not invent new details" is
+    already in rule 2, and the JSON only restates what sentence 1 already fixes.
+    """
+    expected_first_sentence = first_sentence(summary_data)
+    return (
+        "You are a coaching assistant summarizing a squat analysis.\n"
+        "Follow these rules exactly:\n"
+        f"1. Sentence 1 must be exactly: {expected_first_sentence}\n"
+        "2. Write 1 to 2 additional sentences that concisely summarise the main issues described in the paragraph, using only the provided facts.\n"
+        "3. If the paragraph states that no issues were present, emphasise consistent technique instead of inventing problems.\n"
+        "4. Keep the entire summary to at most 3 sentences and end with <END>.\n"
+        "5. Avoid phase-by-phase lists and do not include explicit action or prescription sentences.\n\n"
+        f"{issue_paragraph}"
+    )
+
+
+def minimal_prompt(summary_data, json_line, issue_paragraph):
+    """Short phrasing and no JSON together."""
+    expected_first_sentence = first_sentence(summary_data)
+    return (
+        "Summarize this squat analysis as a coach.\n"
+        f"1. Sentence 1 exactly: {expected_first_sentence}\n"
+        "2. Then 1-2 sentences on the main issues, only from the paragraph; if none, praise consistent technique.\n"
+        "3. Max 3 sentences, no phase lists or instructions, end with <END>.\n\n"
+        f"{issue_paragraph}"
+    )
+
+
+PROMPT_VARIANTS = {
+    "baseline": baseline_prompt,
+    "short_rules": short_rules_prompt,
+    "compact_json": compact_json_prompt,
+    "no_redundancy": no_redundancy_prompt,
+    "minimal": minimal_prompt,
+}
+
+
+def run_variant(name, builder, parsed_blocks):
+    """Sends every prompt built by one variant and returns its per-prompt measurements."""
+    results = []
+    for i, (summary_data, json_line, issue_paragraph) in enumerate(parsed_blocks):
+        full_prompt = builder(summary_data, json_line, issue_paragraph)
+        truth = {
+            "json_input": summary_data,
+            "issue_paragraph": issue_paragraph.replace("Issue paragraph:", "").strip()
+        }
+        try:
+            start_time = time.perf_counter()
+            response = requests.post(OLLAMA_URL, json=build_payload(MODEL_NAME, full_prompt), timeout=REQUEST_TIMEOUT_S)
+            response_time = time.perf_counter() - start_time
+            response.raise_for_status()
+            response_data = response.json()
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"--- ERROR on {name} prompt {i + 1}: {e}")
+            continue
+
+        score, _ = score_reply(truth, response_data.get("message", {}).get("content", ""))
+        results.append({
+            "prompt_num": i + 1,
+            "prompt_chars": len(full_prompt),
+            "response_time_s": response_time,
+            "prompt_eval_count": response_data.get("prompt_eval_count", 0),
+            "prompt_eval_duration_s": response_data.get("prompt_eval_duration", 0) / 1e9,
+            "eval_count": response_data.get("eval_count", 0),
+            "score": score
+        })
+    return results
+
+
+def summarize_variant(results):
+    """Averages a variant's results, excluding the warm-up prompt as qualityAssessment.py does."""
+    measured = [r for r in results if r["prompt_num"] > 1]
+    if not measured:
+        return None
+
+    def mean(key):
+        return sum(r[key] for r in measured) / len(measured)
+
+    return {
+        "prompts": len(measured),
+        "prompt_chars": mean("prompt_chars"),
+        "prompt_eval_count": mean("prompt_eval_count"),
+        "prompt_eval_duration_s": mean("prompt_eval_duration_s"),
+        "response_time_s": mean("response_time_s"),
+        "eval_count": mean("eval_count"),
+        "score": mean("score")
+    }
+
+
+def main():
+    """Benchmarks every prompt variant and picks the shortest one that keeps quality."""
+    parsed_blocks = [p for p in (parse_prompt_block(block) for block in parse_prompts(INPUT_FILE)) if p]
+    if not parsed_blocks:
+        return
+
+    summaries = {}
+    for name, builder in PROMPT_VARIANTS.items():
+        print(f"Running variant '{name}' with {len(parsed_blocks)} prompts...")
+        summary = summarize_variant(run_variant(name, builder, parsed_blocks))
+        if summary:
+            summaries[name] = summary
+
+    if "baseline" not in summaries:
+        print("Baseline variant produced no results. Aborting.")
+        return
+
+    baseline = summaries["baseline"]
+    keeps_quality = [name for name, s in summaries.items() if s["score"] >= baseline["score"] - QUALITY_TOLERANCE]
+    best = min(keeps_quality, key=lambda name: summaries[name]["prompt_eval_count"])
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"--- Prompt Compression Results for Model: {MODEL_NAME} ---\n\n")
+        for name, s in summaries.items():
+            saved = 1 - s["prompt_eval_count"] / baseline["prompt_eval_count"] if baseline["prompt_eval_count"] else 0
+            f.write(f"--- Variant: {name} ---\n")
+            f.write(f"Prompts Assessed: {s['prompts']}\n")
+            f.write(f"Average Prompt Length: {s['prompt_chars']:.0f} chars\n")
+            f.write(f"Average prompt_eval_count: {s['prompt_eval_count']:.1f} tokens ({saved * 100:.1f}% fewer than baseline)\n")
+            f.write(f"Average prompt_eval_duration: {s['prompt_eval_duration_s']:.4f} seconds\n")
+            f.write(f"Average eval_count: {s['eval_count']:.1f} tokens\n")
+            f.write(f"Average Response Time: {s['response_time_s']:.4f} seconds\n")
+            f.write(f"Average Quality Score: {s['score']:.2f} / 5.00\n")
+            f.write(f"Keeps Quality: {'YES' if name in keeps_quality else 'NO'}\n\n")
+
+        f.write("--- Selected Variant ---\n")
+        f.write(f"{best}: {summaries[best]['prompt_eval_count']:.1f} prompt tokens, "
+                f"{summaries[best]['score']:.2f} / 5.00 (baseline {baseline['score']:.2f})\n")
+
+    print(f"\nShortest prompt that keeps quality: '{best}'. Results saved to '{OUTPUT_FILE}'.")
+
+if __name__ == "__main__":
+    if USE_STUB_SERVERS:
+        from stub_ollama_server import start_stub_servers, stop_stub_servers
+        stub_servers = start_stub_servers([STUB_PORT], load_delay_s=0.0, eval_token_s=0.001)
+        OLLAMA_URL = f"http://127.0.0.1:{STUB_PORT}/api/chat"
+        try:
+            main()
+        finally:
+            stop_stub_servers(stub_servers)
+    else:
+        main()
@@ -74,6 +74,88 @@ def parse_stats_file(filepath):
             
     return extracted_contents
 
+ISSUE_PATTERN = r"(legs too wide|legs too narrow|trunk too upright|trunk too forward|arm not extended|arms not extended|left arm not extended|right arm not extended|arm too high|arms too high|left arm too high|right arm too high)"
+
+def score_reply(truth, reply_text):
+    """Scores a single reply against its ground truth. Returns (score, checks)."""
+    score = 0
+    checks = {
+        "sentence_1_correct": False,
+        "sentence_count_ok": False,
+        "has_end_token": False,
+        "no_prescriptive_lang": False,
+        "is_factually_consistent": False
+    }
+
+    if reply_text is None or not reply_text.strip():
+        return score, checks
+
+    # Clean the reply text
+    clean_reply = reply_text.strip()
+    
+    # 3. Check for termination token. Models might use variations.
+    if "<END>" in clean_reply.upper() or clean_reply.upper().endswith("END") or clean_reply.upper().endswith("END."):
+         checks["has_end_token"] = True
+         score += 1
+    
+    # Remove any termination tokens for sentence analysis
+    text_before_end = re.split(r'<END>', clean_reply, flags=re.IGNORECASE)[0].strip()
+    if text_before_end.upper().endswith("END"):
+         text_before_end = text_before_end[:-3].strip().rstrip('.')
+
+    # Use a more robust regex to split sentences, handling multiple delimiters.
+    sentences = [s.strip() for s in re.split(r'[.?!]\s*|\n', text_before_end) if s.strip()]
+
+    # 1. Check Sentence 1 Correctness (FIXED LOGIC)
+    expected_s1_base = f"{truth['json_input']['squatType']} with {truth['json_input']['bottomBias']}"
+    if sentences:
+        model_s1 = sentences[0]
+        
+        # Normalize for comparison: lowercase, remove punctuation, hyphens, and leading articles.
+        def normalize_sentence(s):
+            s = s.lower().strip().rstrip('.,;:')
+            s = s.replace('-', ' ')
+            if s.startswith("the "):
+                s = s[4:]
+            return " ".join(s.split()) # Normalize whitespace
+
+        normalized_model_s1 = normalize_sentence(model_s1)
+        normalized_expected_s1 = normalize_sentence(expected_s1_base)
+
+        # Check if the model's first sentence STARTS WITH the expected phrase.
+        if normalized_model_s1.startswith(normalized_expected_s1):
+            checks["sentence_1_correct"] = True
+            score += 1
+
+    # 2. Check Sentence Count
+    if 2 <= len(sentences) <= 3:
+        checks["sentence_count_ok"] = True
+        score += 1
+
+    # 4. Check for Prescriptive Language
+    summary_text = " ".join(sentences[1:])
+    if not any(keyword in summary_text.lower() for keyword in PRESCRIPTIVE_KEYWORDS):
+        checks["no_prescriptive_lang"] = True
+        score += 1
+        
+    # 5. Factual Consistency
+    truth_issues = set(re.findall(ISSUE_PATTERN, truth["issue_paragraph"]))
+    model_issues = set(re.findall(ISSUE_PATTERN, summary_text.lower()))
+
+    if not truth_issues:
+        # If there are no true issues, the model should not mention any.
+        if not model_issues:
+            checks["is_factually_consistent"] = True
+            score += 1
+    else:
+        # If there are true issues, the model's summary must mention at least one of them,
+        # and must not invent issues that weren't in the paragraph.
+        if model_issues and model_issues.issubset(truth_issues):
+            checks["is_factually_consistent"] = True
+            score += 1
+
+    return score, checks
+
 def assess_quality(model_name, ground_truths, model_replies):
     """Runs the quality assessment for a single model's replies."""
     results = []
@@ -86,82 +168,11 @@ def assess_quality(model_name, ground_truths, model_replies):
         truth = ground_truths[i]
         reply_text = model_replies[i]
         
-        score = 0
-        checks = {
-            "sentence_1_correct": False,
-            "sentence_count_ok": False,
-            "has_end_token": False,
-            "no_prescriptive_lang": False,
-            "is_factually_consistent": False
-        }
+        score, checks = score_reply(truth, reply_text)
 
         if reply_text is None or not reply_text.strip():
             results.append({"prompt_num": prompt_num, "score": 0, "checks": checks, "reply": "JSON DECODE ERROR OR EMPTY REPLY"})
             continue
-
-        # Clean the reply text
-        clean_reply = reply_text.strip()
-        
-        # 3. Check for termination token. Models might use variations.
-        if "<END>" in clean_reply.upper() or clean_reply.upper().endswith("END") or clean_reply.upper().endswith("END."):
-             checks["has_end_token"] = True
-             score += 1
-        
-        # Remove any termination tokens for sentence analysis
-        text_before_end = re.split(r'<END>', clean_reply, flags=re.IGNORECASE)[0].strip()
-        if text_before_end.upper().endswith("END"):
-             text_before_end = text_before_end[:-3].strip().rstrip('.')
-
-        # Use a more robust regex to split sentences, handling multiple delimiters.
-        sentences = [s.strip() for s in re.split(r'[.?!]\s*|\n', text_before_end) if s.strip()]
-
-        # 1. Check Sentence 1 Correctness (FIXED LOGIC)
-        expected_s1_base = f"{truth['json_input']['squatType']} with {truth['json_input']['bottomBias']}"
-        if sentences:
-            model_s1 = sentences[0]
-            
-            # Normalize for comparison: lowercase, remove punctuation, hyphens, and leading articles.
-            def normalize_sentence(s):
-                s = s.lower().strip().rstrip('.,;:')
-                s = s.replace('-', ' ')
-                if s.startswith("the "):
-                    s = s[4:]
-                return " ".join(s.split()) # Normalize whitespace
-
-            normalized_model_s1 = normalize_sentence(model_s1)
-            normalized_expected_s1 = normalize_sentence(expected_s1_base)
-
-            # Check if the model's first sentence STARTS WITH the expected phrase.
-            if normalized_model_s1.startswith(normalized_expected_s1):
-                checks["sentence_1_correct"] = True
-                score += 1
-
-        # 2. Check Sentence Count
-        if 2 <= len(sentences) <= 3:
-            checks["sentence_count_ok"] = True
-            score += 1
-
-        # 4. Check for Prescriptive Language
-        summary_text = " ".join(sentences[1:])
-        if not any(keyword in summary_text.lower() for keyword in PRESCRIPTIVE_KEYWORDS):
-            checks["no_prescriptive_lang"] = True
-            score += 1
-            
-        # 5. Factual Consistency
-        truth_issues = set(re.findall(r"(legs too wide|legs too narrow|trunk too upright|trunk too forward|arm not extended|arms not extended|left arm not extended|right arm not extended|arm too high|arms too high|left arm too high|right arm too high)", truth["issue_paragraph"]))
-        model_issues = set(re.findall(r"(legs too wide|legs too narrow|trunk too upright|trunk too forward|arm not extended|arms not extended|left arm not extended|right arm not extended|arm too high|arms too high|left arm too high|right arm too high)", summary_text.lower()))
-
-        if not truth_issues:
-            # If there are no true issues, the model should not mention any.
-            if not model_issues:
-                checks["is_factually_consistent"] = True
-                score += 1
-        else:
-            # If there are true issues, the model's summary must mention at least one of them,
-            # and must not invent issues that weren't in the paragraph.
-            if model_issues and model_issues.issubset(truth_issues):
-                checks["is_factually_consistent"] = True
-                score += 1
         
         results.append({
             "prompt_num": prompt_num,
@@ -174,25 +185,18 @@ def assess_quality(model_name, ground_truths, model_replies):
 
 # --- Main Execution ---
 
-def main():
-    """Main function to run the full quality assessment and write the report."""
-    ground_truths = parse_input_prompts(INPUT_PROMPTS_FILE)
-    if not ground_truths:
-        return
-
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+def write_report(model_results, output_file=OUTPUT_FILE):
+    """Writes the report for a dict of model name -> assess_quality() results."""
+    with open(output_file, 'w', encoding='utf-8') as f:
         f.write("--- LLM Quality Assessment Results ---\n\n")
         
         overall_scores = {}
 
-        for model_name, stats_file in STATS_FILES.items():
+        for model_name, assessment_results in model_results.items():
             f.write(f"=========================================\n")
             f.write(f"Model: {model_name}\n")
             f.write(f"=========================================\n\n")
             
-            model_replies = parse_stats_file(stats_file)
-            assessment_results = assess_quality(model_name, ground_truths, model_replies)
-            
             if not assessment_results:
                 f.write("No results to assess.\n\n")
                 continue
@@ -239,7 +243,20 @@ def main():
         for model_name, avg_score in sorted(overall_scores.items(), key=lambda item: item[1], reverse=True):
             f.write(f"{model_name}: {avg_score:.2f} / 5.00\n")
         
-    print(f"Quality assessment complete. Results saved to '{OUTPUT_FILE}'.")
+    print(f"Quality assessment complete. Results saved to '{output_file}'.")
+
+def main():
+    """Main function to run the full quality assessment and write the report."""
+    ground_truths = parse_input_prompts(INPUT_PROMPTS_FILE)
+    if not ground_truths:
+        return
+
+    model_results = {}
+    for model_name, stats_file in STATS_FILES.items():
+        model_replies = parse_stats_file(stats_file)
+        model_results[model_name] = assess_quality(model_name, ground_truths, model_replies)
+
+    write_report(model_results)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
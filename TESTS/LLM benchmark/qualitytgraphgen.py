@@ -44,13 +44,13 @@ def parse_quality_results(filepath):
         
     return all_model_data
 
-def create_quality_graphs():
+def create_quality_graphs(input_file=INPUT_FILE, output_dir=OUTPUT_DIR):
     """Main function to load quality data and generate plots."""
-    if not os.path.exists(OUTPUT_DIR):
-        os.makedirs(OUTPUT_DIR)
-        print(f"Created directory: {OUTPUT_DIR}")
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+        print(f"Created directory: {output_dir}")
 
-    parsed_data = parse_quality_results(INPUT_FILE)
+    parsed_data = parse_quality_results(input_file)
     if not parsed_data:
         print("No data parsed from the results file. Aborting.")
         return
@@ -75,7 +75,7 @@ def create_quality_graphs():
                      textcoords='offset points')
 
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, "1_average_quality_score.svg"))
+    plt.savefig(os.path.join(output_dir, "1_average_quality_score.svg"))
     print("Saved: 1_average_quality_score.svg")
     plt.close(fig1)
 
@@ -100,7 +100,7 @@ def create_quality_graphs():
     plt.yticks(rotation=0)
     
     plt.tight_layout()
-    plt.savefig(os.path.join(OUTPUT_DIR, "2_criterion_pass_rate_heatmap.svg"))
+    plt.savefig(os.path.join(output_dir, "2_criterion_pass_rate_heatmap.svg"))
     print("Saved: 2_criterion_pass_rate_heatmap.svg")
     plt.close(fig2)
 
@@ -0,0 +1,229 @@
+import requests
+import json
+import math
+import time
+import random
+import statistics
+
+from ollama_benchmark import parse_prompts, construct_full_prompt, build_payload
+
+# --- Configuration ---
+# Display name -> Ollama model name
+MODELS = {
+    "Qwen-1.5B": "testqwencoach",
+    "Llama3.2-3B-Q4_S": "test3bscoach",
+    "Llama3.2-3B-Q4_M": "newsum3bmcoach",
+    "Phi-3.5-3.8B": "testphicoach",
+}
+INPUT_FILE = "100SquateInputPrompt.txt"
+OUTPUT_FILE = "repeated_trials_results.txt"
+RAW_OUTPUT_FILE = "repeated_trials_raw.csv"
+OLLAMA_URL = "http://localhost:11434/api/chat"
+REQUEST_TIMEOUT_S = 150
+
+NUM_TRIALS = 5              # repetitions of every prompt on every model
+PROMPT_LIMIT = None         # only use the first N prompts (None = all)
+ORDERING = "latin_square"   # "fixed", "random" or "latin_square"
+ORDER_SEED = 4713
+# Subtract Ollama's load_duration so model swaps between interleaved requests don't count as latency
+EXCLUDE_LOAD_DURATION = True
+# Target half-width of the 95% confidence interval, relative to the mean, for the trials-needed estimate
+TARGET_RELATIVE_PRECISION = 0.05
+
+# Set to True to run against a local stand-in server instead of a real Ollama instance
+USE_STUB_SERVERS = False
+STUB_PORT = 11501
+
+
+def build_schedule(model_names, num_prompts):
+    """
+    Returns the run order as a list of (trial, model, prompt index).
+    fixed:        every model in turn, all trials of prompts 1..N in file order (the old behaviour).
+    random:       all (trial, model, prompt) runs fully shuffled.
+    latin_square: each trial visits the prompts in a fresh random order, and at each prompt the
+                  models run in a rotated order so every model takes every position equally often.
+    """
+    rng = random.Random(ORDER_SEED)
+    if ORDERING == "fixed":
+        return [(t, m, p) for m in model_names for t in range(NUM_TRIALS) for p in range(num_prompts)]
+
+    if ORDERING == "random":
+        schedule = [(t, m, p) for t in range(NUM_TRIALS) for m in model_names for p in range(num_prompts)]
+        rng.shuffle(schedule)
+        return schedule
+
+    if ORDERING == "latin_square":
+        schedule = []
+        k = len(model_names)
+        for t in range(NUM_TRIALS):
+            prompt_order = list(range(num_prompts))
+            rng.shuffle(prompt_order)
+            for position, p in enumerate(prompt_order):
+                shift = (position + t) % k
+                for m in model_names[shift:] + model_names[:shift]:
+                    schedule.append((t, m, p))
+        return schedule
+
+    raise ValueError(f"Unknown ordering '{ORDERING}'")
+
+
+def run_schedule(schedule, full_prompts):
+    """Executes the schedule and returns one record per request."""
+    records = []
+    for sequence, (trial, model_name, prompt_index) in enumerate(schedule):
+        if sequence % 50 == 0:
+            print(f"Request {sequence + 1}/{len(schedule)}...")
+        payload = build_payload(MODELS[model_name], full_prompts[prompt_index])
+        try:
+            start_time = time.perf_counter()
+            response = requests.post(OLLAMA_URL, json=payload, timeout=REQUEST_TIMEOUT_S)
+            response_time = time.perf_counter() - start_time
+            response.raise_for_status()
+            load_duration = response.json().get("load_duration", 0) / 1e9
+        except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            print(f"--- ERROR on {model_name} prompt {prompt_index + 1} trial {trial + 1}: {e}")
+            continue
+
+        latency = response_time - load_duration if EXCLUDE_LOAD_DURATION else response_time
+        records.append({
+            "sequence": sequence,
+            "trial": trial,
+            "model": model_name,
+            "prompt_num": prompt_index + 1,
+            "response_time_s": response_time,
+            "load_duration_s": load_duration,
+            "latency_s": latency
+        })
+    return records
+
+
+def variance_analysis(records):
+    """
+    One-way random-effects decomposition of latency with prompts as groups.
+    Returns within-prompt and between-prompt variance components, the ICC, the
+    per-prompt coefficient of variation and the trials needed for TARGET_RELATIVE_PRECISION.
+    """
+    by_prompt = {}
+    for r in records:
+        by_prompt.setdefault(r["prompt_num"], []).append(r["latency_s"])
+    groups = [v for v in by_prompt.values() if len(v) >= 2]
+    if len(groups) < 2:
+        return None
+
+    all_values = [x for g in groups for x in g]
+    grand_mean = statistics.fmean(all_values)
+    n_total = len(all_values)
+    k = len(groups)
+
+    ss_within = sum(sum((x - statistics.fmean(g)) ** 2 for x in g) for g in groups)
+    ss_between = sum(len(g) * (statistics.fmean(g) - grand_mean) ** 2 for g in groups)
+    ms_within = ss_within / (n_total - k)
+    ms_between = ss_between / (k - 1)
+    # Average group size, adjusted for unequal sizes after errors
+    n0 = (n_total - sum(len(g) ** 2 for g in groups) / n_total) / (k - 1)
+    var_between = max(0.0, (ms_between - ms_within) / n0)
+
+    cvs = sorted(statistics.stdev(g) / statistics.fmean(g) for g in groups if statistics.fmean(g) > 0)
+    median_cv = statistics.median(cvs) if cvs else 0
+    p90_cv = cvs[int(0.9 * (len(cvs) - 1))] if cvs else 0
+    worst_cv = cvs[-1] if cvs else 0
+
+    def trials_needed(cv):
+        # n such that 1.96 * cv / sqrt(n) <= target precision
+        return max(1, math.ceil((1.96 * cv / TARGET_RELATIVE_PRECISION) ** 2))
+
+    return {
+        "prompts": k,
+        "samples": n_total,
+        "mean_s": grand_mean,
+        "var_within": ms_within,
+        "var_between": var_between,
+        "icc": var_between / (var_between + ms_within) if (var_between + ms_within) > 0 else 0,
+        "overall_cv": statistics.stdev(all_values) / grand_mean if grand_mean > 0 else 0,
+        "median_cv": median_cv,
+        "p90_cv": p90_cv,
+        "worst_cv": worst_cv,
+        "trials_needed_median": trials_needed(median_cv),
+        "trials_needed_p90": trials_needed(p90_cv)
+    }
+
+
+def order_effect(records):
+    """
+    Least-squares slope of (latency - that prompt's mean) against run position, in ms per
+    100 requests. A clear non-zero slope points to drift such as thermal throttling.
+    """
+    prompt_means = {}
+    for r in records:
+        prompt_means.setdefault(r["prompt_num"], []).append(r["latency_s"])
+    prompt_means = {p: statistics.fmean(v) for p, v in prompt_means.items()}
+
+    xs = [r["sequence"] for r in records]
+    ys = [r["latency_s"] - prompt_means[r["prompt_num"]] for r in records]
+    if len(xs) < 2 or len(set(xs)) < 2:
+        return 0.0
+    mean_x = statistics.fmean(xs)
+    mean_y = statistics.fmean(ys)
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+    return slope * 100 * 1000
+
+
+def main():
+    prompts = parse_prompts(INPUT_FILE)
+    full_prompts = [p for p in (construct_full_prompt(block)[0] for block in prompts) if p]
+    if PROMPT_LIMIT is not None:
+        full_prompts = full_prompts[:PROMPT_LIMIT]
+    if not full_prompts:
+        return
+
+    schedule = build_schedule(list(MODELS.keys()), len(full_prompts))
+    print(f"Running {len(schedule)} requests ({NUM_TRIALS} trials x {len(full_prompts)} prompts x "
+          f"{len(MODELS)} models, {ORDERING} order)...")
+    records = run_schedule(schedule, full_prompts)
+
+    with open(RAW_OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write("sequence,trial,model,prompt_num,response_time_s,load_duration_s,latency_s\n")
+        for r in records:
+            f.write(f"{r['sequence']},{r['trial'] + 1},{r['model']},{r['prompt_num']},"
+                    f"{r['response_time_s']:.4f},{r['load_duration_s']:.4f},{r['latency_s']:.4f}\n")
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write("--- Repeated-Trial Latency Variance ---\n\n")
+        f.write(f"Ordering: {ORDERING} (seed {ORDER_SEED})\n")
+        f.write(f"Trials per Prompt: {NUM_TRIALS}\n")
+        f.write(f"Load Duration Excluded: {'YES' if EXCLUDE_LOAD_DURATION else 'NO'}\n\n")
+
+        for model_name in MODELS:
+            model_records = [r for r in records if r["model"] == model_name]
+            f.write("=========================================\n")
+            f.write(f"Model: {model_name}\n")
+            f.write("=========================================\n\n")
+            analysis = variance_analysis(model_records)
+            if analysis is None:
+                f.write("Not enough successful repeated runs to analyse.\n\n")
+                continue
+            f.write(f"Samples: {analysis['samples']} over {analysis['prompts']} prompts\n")
+            f.write(f"Mean Latency: {analysis['mean_s']:.4f} seconds\n")
+            f.write(f"Within-Prompt Variance: {analysis['var_within']:.6f} s^2 (SD {analysis['var_within'] ** 0.5:.4f} s)\n")
+            f.write(f"Between-Prompt Variance: {analysis['var_between']:.6f} s^2 (SD {analysis['var_between'] ** 0.5:.4f} s)\n")
+            f.write(f"Share of Variance Between Prompts (ICC): {analysis['icc']:.3f}\n")
+            f.write(f"Overall CV: {analysis['overall_cv'] * 100:.1f}%\n")
+            f.write(f"Per-Prompt CV: median {analysis['median_cv'] * 100:.1f}%, p90 {analysis['p90_cv'] * 100:.1f}%, "
+                    f"max {analysis['worst_cv'] * 100:.1f}%\n")
+            f.write(f"Run-Order Drift: {order_effect(model_records):+.2f} ms per 100 requests\n")
+            f.write(f"Trials Needed for +/-{TARGET_RELATIVE_PRECISION * 100:.0f}% (95% CI): "
+                    f"{analysis['trials_needed_median']} (median prompt), {analysis['trials_needed_p90']} (p90 prompt)\n\n")
+
+    print(f"\nRepeated-trial benchmark complete. Results saved to '{OUTPUT_FILE}' and '{RAW_OUTPUT_FILE}'.")
+
+if __name__ == "__main__":
+    if USE_STUB_SERVERS:
+        from stub_ollama_server import start_stub_servers, stop_stub_servers
+        stub_servers = start_stub_servers([STUB_PORT], load_delay_s=0.0, eval_token_s=0.001, max_loaded_models=len(MODELS))
+        OLLAMA_URL = f"http://127.0.0.1:{STUB_PORT}/api/chat"
+        try:
+            main()
+        finally:
+            stop_stub_servers(stub_servers)
+    else:
+        main()
@@ -0,0 +1,173 @@
+import re
+import time
+from collections import OrderedDict
+
+from ollama_benchmark import parse_stats_records
+from qualityAssessment import parse_input_prompts, score_reply, ISSUE_PATTERN, STATS_FILES
+
+# --- Configuration ---
+# Replays the stats files listed in qualityAssessment.STATS_FILES
+INPUT_PROMPTS_FILE = "100SquateInputPrompt.txt"
+OUTPUT_FILE = "response_cache_results.txt"
+
+# Cache sizes to replay each session with (number of distinct keys kept)
+CACHE_CAPACITIES = [4, 8, 16, 32, 64]
+# A reply is only admitted to the cache if it scores at least this on assess_quality's 5 checks
+ADMISSION_MIN_SCORE = 4
+
+PHASE_EVENT_PATTERN = r"(first appeared in|persisted through|corrected by|reappeared in|absent temporarily)\s*(standing|descending|bottom|ascending)?"
+
+
+def normalize_rep_key(truth):
+    """
+    Builds the cache key for one rep from its parsed input prompt.
+    The key is (squatType, bottomBias, issues) where issues is a frozenset of
+    (issue, phase events) pairs. Continuous fields such as maxDepthCm are ignored
+    because the summary never depends on them.
+    """
+    json_input = truth["json_input"]
+    squat_type = " ".join(str(json_input.get("squatType", "")).lower().split())
+    bottom_bias = " ".join(str(json_input.get("bottomBias", "")).lower().split())
+
+    issues = []
+    for sentence in re.split(r"[.;]\s*", truth["issue_paragraph"].lower()):
+        issue_match = re.search(ISSUE_PATTERN, sentence)
+        if not issue_match:
+            # e.g. "No non-bias issues were detected..." contributes nothing
+            continue
+        events = tuple(re.findall(PHASE_EVENT_PATTERN, sentence))
+        issues.append((issue_match.group(1), events))
+
+    return squat_type, bottom_bias, frozenset(issues)
+
+
+class SemanticResponseCache:
+    """LRU cache of validated LLM replies keyed on normalize_rep_key()."""
+
+    def __init__(self, capacity, min_score=ADMISSION_MIN_SCORE):
+        self.capacity = capacity
+        self.min_score = min_score
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Returns the cached reply for key (marking it most recently used), or None."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, reply_text, score):
+        """Admits a reply only if it passed quality validation; evicts the LRU entry when full."""
+        if score < self.min_score:
+            self.rejected += 1
+            return False
+        self._entries[key] = reply_text
+        self._entries.move_to_end(key)
+        self.admitted += 1
+        if len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return True
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def replay_session(ground_truths, records, capacity):
+    """
+    Replays one recorded benchmark session through a cache of the given capacity.
+    Misses cost the recorded response time; hits save it. Returns a summary dict.
+    """
+    cache = SemanticResponseCache(capacity)
+    total_recorded_time = 0.0
+    latency_saved = 0.0
+    lookup_time = 0.0
+    served_scores = []
+
+    for record in records:
+        index = record["prompt_num"] - 1
+        if index >= len(ground_truths) or record["reply"] is None:
+            continue
+        truth = ground_truths[index]
+        key = normalize_rep_key(truth)
+        total_recorded_time += record["response_time_s"]
+
+        start_time = time.perf_counter()
+        cached_reply = cache.get(key)
+        lookup_time += time.perf_counter() - start_time
+
+        if cached_reply is not None:
+            latency_saved += record["response_time_s"]
+            # Re-score against this rep's own ground truth to confirm the reuse was safe
+            score, _ = score_reply(truth, cached_reply)
+            served_scores.append(score)
+            continue
+
+        reply_text = record["reply"].get("message", {}).get("content", "")
+        score, _ = score_reply(truth, reply_text)
+        cache.put(key, reply_text, score)
+
+    lookups = cache.hits + cache.misses
+    return {
+        "capacity": capacity,
+        "lookups": lookups,
+        "hits": cache.hits,
+        "misses": cache.misses,
+        "admitted": cache.admitted,
+        "rejected": cache.rejected,
+        "evictions": cache.evictions,
+        "hit_rate": cache.hits / lookups if lookups > 0 else 0,
+        "total_recorded_time_s": total_recorded_time,
+        "latency_saved_s": latency_saved,
+        "saved_share": latency_saved / total_recorded_time if total_recorded_time > 0 else 0,
+        "lookup_time_s": lookup_time,
+        "avg_served_score": sum(served_scores) / len(served_scores) if served_scores else 0
+    }
+
+
+def main():
+    """Replays every recorded session through the cache and writes the report."""
+    ground_truths = parse_input_prompts(INPUT_PROMPTS_FILE)
+    if not ground_truths:
+        return
+
+    distinct_keys = len({normalize_rep_key(truth) for truth in ground_truths})
+    print(f"{len(ground_truths)} prompts map to {distinct_keys} distinct cache keys.")
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write("--- Semantic Response Cache Replay ---\n\n")
+        f.write(f"Prompts: {len(ground_truths)}\n")
+        f.write(f"Distinct cache keys: {distinct_keys}\n")
+        f.write(f"Admission policy: quality score >= {ADMISSION_MIN_SCORE}/5\n\n")
+
+        for model_name, stats_file in STATS_FILES.items():
+            records = parse_stats_records(stats_file)
+            if not records:
+                continue
+
+            f.write("=========================================\n")
+            f.write(f"Model: {model_name}\n")
+            f.write("=========================================\n\n")
+
+            for capacity in CACHE_CAPACITIES:
+                summary = replay_session(ground_truths, records, capacity)
+                f.write(f"--- Capacity {capacity} ---\n")
+                f.write(f"Hits / Lookups: {summary['hits']} / {summary['lookups']} ({summary['hit_rate'] * 100:.1f}%)\n")
+                f.write(f"Admitted: {summary['admitted']}, Rejected: {summary['rejected']}, Evictions: {summary['evictions']}\n")
+                f.write(f"Latency Saved: {summary['latency_saved_s']:.4f} of {summary['total_recorded_time_s']:.4f} seconds ({summary['saved_share'] * 100:.1f}%)\n")
+                f.write(f"Total Lookup Overhead: {summary['lookup_time_s'] * 1000:.3f} ms\n")
+                f.write(f"Average Score of Served Hits: {summary['avg_served_score']:.2f} / 5.00\n\n")
+
+            print(f"Replayed {model_name} with capacities {CACHE_CAPACITIES}.")
+
+    print(f"\nCache replay complete. Results saved to '{OUTPUT_FILE}'.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+import requests
+import json
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from ollama_benchmark import parse_prompts, construct_full_prompt, build_payload
+
+# --- Configuration ---
+MODEL_NAME = "newsum3bmcoach"
+INPUT_FILE = "100SquateInputPrompt.txt"
+OUTPUT_FILE = "sharded_benchmark_stats.txt"
+# One entry per Ollama instance, e.g. started with OLLAMA_HOST=127.0.0.1:11435 ollama serve
+ENDPOINTS = [
+    "http://localhost:11434/api/chat",
+    "http://localhost:11435/api/chat",
+    "http://localhost:11436/api/chat",
+]
+SCHEDULER = "least_outstanding"  # "least_outstanding" or "latency_aware"
+CONCURRENCY = 6                  # requests in flight across all endpoints
+REQUEST_TIMEOUT_S = 150
+# Weight given to the newest sample in each endpoint's latency moving average
+LATENCY_EWMA_ALPHA = 0.3
+# After a failed request an endpoint is skipped for this long, unless every endpoint is down,
+# and then probed again as if unmeasured
+ENDPOINT_COOLOFF_S = 10.0
+
+# Set to True to run against local stand-in servers instead of real Ollama instances
+USE_STUB_SERVERS = False
+STUB_PORTS = [11501, 11502, 11503]
+
+
+class EndpointScheduler:
+    """
+    Picks the endpoint for each request and tracks per-endpoint state.
+    least_outstanding sends to the endpoint with the fewest requests in flight;
+    latency_aware weighs that queue by each endpoint's smoothed latency. With either
+    strategy an endpoint that just failed is left out for ENDPOINT_COOLOFF_S; failures
+    never enter the latency average.
+    """
+
+    def __init__(self, endpoints, strategy):
+        if strategy not in ("least_outstanding", "latency_aware"):
+            raise ValueError(f"Unknown scheduler '{strategy}'")
+        self.endpoints = list(endpoints)
+        self.strategy = strategy
+        self.lock = threading.Lock()
+        self.outstanding = {endpoint: 0 for endpoint in self.endpoints}
+        self.ewma_latency = {endpoint: None for endpoint in self.endpoints}
+        self.down_until = {endpoint: 0.0 for endpoint in self.endpoints}
+
+    def _cost(self, endpoint):
+        queued = self.outstanding[endpoint] + 1
+        if self.strategy == "least_outstanding":
+            return queued
+        latency = self.ewma_latency[endpoint]
+        if latency is None:
+            # Unmeasured endpoints are assumed as fast as the best measured one, and no slower than
+            # 1s, so they get a sample soon but the first burst is still spread by queue
+            latency = min([l for l in self.ewma_latency.values() if l is not None] + [1.0])
+        return queued * latency
+
+    def acquire(self):
+        """Chooses an endpoint and counts the request as outstanding on it."""
+        with self.lock:
+            now = time.monotonic()
+            for endpoint in self.endpoints:
+                if 0 < self.down_until[endpoint] <= now:
+                    # Cool-off over: forget the old latency so the endpoint is probed again
+                    self.down_until[endpoint] = 0.0
+                    self.ewma_latency[endpoint] = None
+            available = [endpoint for endpoint in self.endpoints if self.down_until[endpoint] <= now] or self.endpoints
+            lowest = min(self._cost(endpoint) for endpoint in available)
+            candidates = [endpoint for endpoint in available if self._cost(endpoint) == lowest]
+            endpoint = random.choice(candidates)
+            self.outstanding[endpoint] += 1
+            return endpoint
+
+    def release(self, endpoint, latency=None, failed=False):
+        """Marks a request as finished and folds its latency into the moving average, or starts a cool-off if it failed."""
+        with self.lock:
+            self.outstanding[endpoint] -= 1
+            if failed:
+                self.down_until[endpoint] = time.monotonic() + ENDPOINT_COOLOFF_S
+            elif latency is not None:
+                previous = self.ewma_latency[endpoint]
+                if previous is None:
+                    self.ewma_latency[endpoint] = latency
+                else:
+                    self.ewma_latency[endpoint] = LATENCY_EWMA_ALPHA * latency + (1 - LATENCY_EWMA_ALPHA) * previous
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of a list of numbers (pct in 0..100)."""
+    if not values:
+        return 0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def send_request(scheduler, prompt_num, full_prompt):
+    """Sends one prompt to the endpoint chosen by the scheduler and returns its result record."""
+    endpoint = scheduler.acquire()
+    latency = None
+    try:
+        start_time = time.perf_counter()
+        response = requests.post(endpoint, json=build_payload(MODEL_NAME, full_prompt), timeout=REQUEST_TIMEOUT_S)
+        end_time = time.perf_counter()
+        response.raise_for_status()
+        response_data = response.json()
+
+        latency = end_time - start_time
+        return {
+            "prompt_num": prompt_num,
+            "endpoint": endpoint,
+            "response_time_s": latency,
+            "eval_count": response_data.get('eval_count', 0),
+            "finished_at": end_time,
+            "error": None
+        }
+    except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+        print(f"--- ERROR on prompt {prompt_num} via {endpoint}: {e}")
+        return {
+            "prompt_num": prompt_num,
+            "endpoint": endpoint,
+            "response_time_s": 0,
+            "eval_count": 0,
+            "finished_at": time.perf_counter(),
+            "error": str(e)
+        }
+    finally:
+        scheduler.release(endpoint, latency, failed=latency is None)
+
+
+def summarize(results, wall_time):
+    """Returns throughput and latency figures for a list of result records."""
+    successful = [r for r in results if r["error"] is None]
+    latencies = [r["response_time_s"] for r in successful]
+    tokens = sum(r["eval_count"] for r in successful)
+    return {
+        "requests": len(results),
+        "successful": len(successful),
+        "errors": len(results) - len(successful),
+        "requests_per_second": len(successful) / wall_time if wall_time > 0 else 0,
+        "tokens_per_second": tokens / wall_time if wall_time > 0 else 0,
+        "mean_s": sum(latencies) / len(latencies) if latencies else 0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "max_s": max(latencies) if latencies else 0
+    }
+
+
+def write_summary(f, title, summary):
+    f.write(f"--- {title} ---\n")
+    f.write(f"Requests: {summary['requests']} (Successful: {summary['successful']}, Errors: {summary['errors']})\n")
+    f.write(f"Throughput: {summary['requests_per_second']:.3f} requests/s, {summary['tokens_per_second']:.2f} tokens/s\n")
+    f.write(f"Latency Mean: {summary['mean_s']:.4f} s\n")
+    f.write(f"Latency p50 / p95 / p99 / max: {summary['p50_s']:.4f} / {summary['p95_s']:.4f} / {summary['p99_s']:.4f} / {summary['max_s']:.4f} s\n\n")
+
+
+def run_sharded_benchmark(endpoints):
+    """Dispatches every prompt across the endpoints and writes per-endpoint and aggregate stats."""
+    prompts = parse_prompts(INPUT_FILE)
+    if not prompts:
+        return
+
+    jobs = []
+    for i, prompt_block in enumerate(prompts):
+        full_prompt, _ = construct_full_prompt(prompt_block)
+        if full_prompt:
+            jobs.append((i + 1, full_prompt))
+
+    scheduler = EndpointScheduler(endpoints, SCHEDULER)
+    print(f"Dispatching {len(jobs)} prompts for '{MODEL_NAME}' across {len(endpoints)} endpoints "
+          f"({SCHEDULER}, concurrency {CONCURRENCY})...")
+
+    start_time = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=CONCURRENCY) as pool:
+        results = list(pool.map(lambda job: send_request(scheduler, *job), jobs))
+    wall_time = time.perf_counter() - start_time
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"--- Sharded Benchmark for Model: {MODEL_NAME} ---\n\n")
+        f.write(f"Scheduler: {SCHEDULER}\n")
+        f.write(f"Concurrency: {CONCURRENCY}\n")
+        f.write(f"Wall Time: {wall_time:.4f} seconds\n\n")
+
+        for endpoint in endpoints:
+            endpoint_results = [r for r in results if r["endpoint"] == endpoint]
+            # Per-endpoint throughput is measured over the same wall time so the figures add up
+            write_summary(f, f"Endpoint {endpoint}", summarize(endpoint_results, wall_time))
+
+        write_summary(f, "Aggregate", summarize(results, wall_time))
+
+    print(f"\nSharded benchmark complete in {wall_time:.2f}s. Results saved to '{OUTPUT_FILE}'.")
+
+
+if __name__ == "__main__":
+    if USE_STUB_SERVERS:
+        from stub_ollama_server import start_stub_servers, stop_stub_servers
+        stub_servers = start_stub_servers(STUB_PORTS)
+        try:
+            run_sharded_benchmark([f"http://127.0.0.1:{port}/api/chat" for port in STUB_PORTS])
+        finally:
+            stop_stub_servers(stub_servers)
+    else:
+        run_sharded_benchmark(ENDPOINTS)
@@ -0,0 +1,284 @@
+import requests
+import json
+import os
+import time
+import random
+from collections import deque
+from datetime import datetime
+
+from ollama_benchmark import parse_prompts, construct_full_prompt, build_payload
+from sharded_benchmark import percentile
+
+# --- Configuration ---
+MODEL_NAME = "newsum3bmcoach"
+INPUT_FILE = "100SquateInputPrompt.txt"
+LOG_FILE = "soak_log.txt"              # one line per window, appended as the test runs
+OUTPUT_FILE = "soak_results.txt"
+OLLAMA_BASE_URL = "http://localhost:11434"
+REQUEST_TIMEOUT_S = 150
+
+SOAK_DURATION_S = 8 * 3600             # one gym shift
+MEAN_REP_INTERVAL_S = 6.0              # average time between rep summaries (Poisson arrivals)
+WINDOW_S = 300                         # aggregation window
+MAX_WINDOWS_KEPT = 288                 # 24 h of 5-minute windows; older windows are dropped
+RSS_SAMPLE_INTERVAL_S = 30
+TRAFFIC_SEED = 4713
+
+# Server processes whose resident memory is summed (the runner is a child of the main server)
+SERVER_PROCESS_NAMES = ("ollama", "ollama.exe", "ollama_llama_server", "ollama_llama_server.exe")
+SERVER_PID = None                      # set to watch one specific process instead
+
+# Alerting
+BASELINE_WINDOWS = 3                   # first windows used as the latency baseline
+MIN_WINDOWS_FOR_TREND = 6
+TREND_WINDOWS = 12                     # latency trend is fitted over the most recent hour only
+LATENCY_DRIFT_THRESHOLD = 0.20         # window mean more than 20% above baseline
+SLOWDOWN_THRESHOLD_PCT_PER_HOUR = 5.0  # fitted latency trend, relative to baseline
+LEAK_THRESHOLD_MB_PER_HOUR = 50.0      # fitted server RSS trend
+# Each alert is reported when it starts and again once its measure falls below this share of the threshold
+ALERT_CLEAR_RATIO = 0.8
+
+# Set to True to run against a local stand-in server instead of a real Ollama instance
+USE_STUB_SERVERS = False
+STUB_PORT = 11501
+# Latency the stub adds per request served, so a stub run exercises the drift and slowdown alerts
+# (about +0.3 s per hour at the default traffic, against a ~0.7 s baseline); 0 for a steady stub
+STUB_SLOWDOWN_PER_REQUEST_S = 0.0005
+
+
+def process_rss_bytes(pid):
+    """Resident memory of one process, via psutil when installed, else /proc on Linux."""
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except ImportError:
+        pass
+    except Exception:
+        return None
+    try:
+        with open(f"/proc/{pid}/status", 'r') as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def server_rss_bytes():
+    """Total RSS of the model server processes, or None if it cannot be measured here."""
+    if SERVER_PID is not None:
+        return process_rss_bytes(SERVER_PID)
+    try:
+        import psutil
+    except ImportError:
+        return None
+    total = 0
+    found = False
+    for proc in psutil.process_iter(["name", "memory_info"]):
+        if (proc.info["name"] or "").lower() in SERVER_PROCESS_NAMES and proc.info["memory_info"]:
+            total += proc.info["memory_info"].rss
+            found = True
+    return total if found else None
+
+
+def linear_fit(xs, ys):
+    """Least-squares slope and intercept; (0, mean) if xs has no spread."""
+    n = len(xs)
+    mean_x = sum(xs) / n
+    mean_y = sum(ys) / n
+    sxx = sum((x - mean_x) ** 2 for x in xs)
+    if sxx == 0:
+        return 0.0, mean_y
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sxx
+    return slope, mean_y - slope * mean_x
+
+
+def close_window(window_start_h, latencies, errors, rss_samples):
+    """Turns the raw samples of one window into a small summary dict."""
+    return {
+        "start_h": window_start_h,
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_s": sum(latencies) / len(latencies) if latencies else None,
+        "p95_s": percentile(latencies, 95) if latencies else None,
+        "rss_mb": sum(rss_samples) / len(rss_samples) / 1e6 if rss_samples else None
+    }
+
+
+def check_alerts(windows, baseline_mean, active):
+    """
+    Evaluates the drift, slowdown and memory checks on the retained window history.
+    active holds the alerts currently raised; only changes are returned, as messages
+    starting with ALERT (condition started) or CLEARED (measure fell below
+    ALERT_CLEAR_RATIO of its threshold). A check without enough data keeps its state.
+    """
+    measures = {}
+    latest = windows[-1]
+    if baseline_mean and latest["mean_s"] is not None:
+        drift = latest["mean_s"] / baseline_mean - 1
+        measures["LATENCY DRIFT"] = (drift, LATENCY_DRIFT_THRESHOLD,
+                                     f"window mean {latest['mean_s']:.3f}s is {drift * 100:.0f}% above baseline {baseline_mean:.3f}s")
+
+    timed = [w for w in windows if w["mean_s"] is not None][-TREND_WINDOWS:]
+    if baseline_mean and len(timed) >= MIN_WINDOWS_FOR_TREND:
+        slope, _ = linear_fit([w["start_h"] for w in timed], [w["mean_s"] for w in timed])
+        pct_per_hour = slope / baseline_mean * 100
+        measures["GRADUAL SLOWDOWN"] = (pct_per_hour, SLOWDOWN_THRESHOLD_PCT_PER_HOUR,
+                                        f"latency trend {pct_per_hour:+.1f}% per hour over the last {len(timed)} windows")
+
+    # Skip the baseline windows, where model loading dominates memory growth
+    sized = [w for w in windows[BASELINE_WINDOWS:] if w["rss_mb"] is not None] if len(windows) > BASELINE_WINDOWS else []
+    if len(sized) >= MIN_WINDOWS_FOR_TREND:
+        slope, _ = linear_fit([w["start_h"] for w in sized], [w["rss_mb"] for w in sized])
+        measures["MEMORY GROWTH"] = (slope, LEAK_THRESHOLD_MB_PER_HOUR, f"server RSS trend {slope:+.0f} MB per hour")
+
+    messages = []
+    for name, (value, threshold, detail) in measures.items():
+        if name not in active and value > threshold:
+            active.add(name)
+            messages.append(f"ALERT {name}: {detail}")
+        elif name in active and value < threshold * ALERT_CLEAR_RATIO:
+            active.discard(name)
+            messages.append(f"CLEARED {name}: {detail}")
+    return messages
+
+
+def run_soak():
+    """Drives Poisson traffic for SOAK_DURATION_S, logging each window and raising drift/leak alerts."""
+    full_prompts = [p for p in (construct_full_prompt(block)[0] for block in parse_prompts(INPUT_FILE)) if p]
+    if not full_prompts:
+        return
+
+    rng = random.Random(TRAFFIC_SEED)
+    url = f"{OLLAMA_BASE_URL}/api/chat"
+    windows = deque(maxlen=MAX_WINDOWS_KEPT)
+    baseline_means = []
+    all_alerts = deque(maxlen=1000)
+    active_alerts = set()
+    totals = {"requests": 0, "errors": 0}
+
+    # Per-window buffers; bounded by WINDOW_S / MEAN_REP_INTERVAL_S and WINDOW_S / RSS_SAMPLE_INTERVAL_S
+    latencies, rss_samples, window_errors = [], [], 0
+
+    # Warm-up request so the initial model load does not inflate the baseline
+    try:
+        requests.post(url, json=build_payload(MODEL_NAME, full_prompts[0]), timeout=REQUEST_TIMEOUT_S).raise_for_status()
+    except requests.exceptions.RequestException as e:
+        print(f"Warning: Warm-up request failed: {e}")
+
+    start = time.monotonic()
+    window_start = start
+    next_send = start
+    next_rss = start
+
+    print(f"Soak test for '{MODEL_NAME}': {SOAK_DURATION_S / 3600:.1f} h, one rep every ~{MEAN_REP_INTERVAL_S}s, "
+          f"{WINDOW_S}s windows. Logging to '{LOG_FILE}'.")
+    with open(LOG_FILE, 'a', encoding='utf-8') as log:
+        log.write(f"--- Soak test started {datetime.now().isoformat(timespec='seconds')} for {MODEL_NAME} ---\n")
+
+        while True:
+            now = time.monotonic()
+            if now - start >= SOAK_DURATION_S:
+                break
+
+            if now >= next_rss:
+                rss = server_rss_bytes()
+                if rss is not None:
+                    rss_samples.append(rss)
+                next_rss = now + RSS_SAMPLE_INTERVAL_S
+
+            if now >= next_send:
+                payload = build_payload(MODEL_NAME, rng.choice(full_prompts))
+                try:
+                    request_start = time.perf_counter()
+                    response = requests.post(url, json=payload, timeout=REQUEST_TIMEOUT_S)
+                    latency = time.perf_counter() - request_start
+                    response.raise_for_status()
+                    response.json()
+                    latencies.append(latency)
+                except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+                    print(f"--- ERROR: {e}")
+                    window_errors += 1
+                    totals["errors"] += 1
+                totals["requests"] += 1
+                # Schedule from the previous send time, but never try to catch up with a burst
+                next_send = max(next_send + rng.expovariate(1 / MEAN_REP_INTERVAL_S), time.monotonic())
+
+            now = time.monotonic()
+            if now - window_start >= WINDOW_S:
+                window = close_window((window_start - start) / 3600, latencies, window_errors, rss_samples)
+                windows.append(window)
+                if len(baseline_means) < BASELINE_WINDOWS and window["mean_s"] is not None:
+                    baseline_means.append(window["mean_s"])
+                baseline_mean = sum(baseline_means) / len(baseline_means) if len(baseline_means) == BASELINE_WINDOWS else None
+
+                mean_text = f"{window['mean_s']:.4f}" if window["mean_s"] is not None else "n/a"
+                p95_text = f"{window['p95_s']:.4f}" if window["p95_s"] is not None else "n/a"
+                rss_text = f"{window['rss_mb']:.0f} MB" if window["rss_mb"] is not None else "n/a"
+                log.write(f"{window['start_h']:7.3f} h | requests {window['requests']:4d} | errors {window['errors']:3d} | "
+                          f"mean {mean_text} s | p95 {p95_text} s | server RSS {rss_text}\n")
+                for alert in check_alerts(list(windows), baseline_mean, active_alerts):
+                    message = f"[{window['start_h']:.2f} h] {alert}"
+                    print(message)
+                    log.write(f"{message}\n")
+                    all_alerts.append(message)
+                log.flush()
+
+                latencies, rss_samples, window_errors = [], [], 0
+                window_start = now
+
+            time.sleep(max(0.0, min(next_send, next_rss, window_start + WINDOW_S) - time.monotonic()))
+
+    write_summary(list(windows), baseline_means, list(all_alerts), totals, time.monotonic() - start)
+
+
+def write_summary(windows, baseline_means, alerts, totals, elapsed):
+    """Writes the end-of-run report from the retained windows."""
+    timed = [w for w in windows if w["mean_s"] is not None]
+    sized = [w for w in windows if w["rss_mb"] is not None]
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write(f"--- Soak Test Results for Model: {MODEL_NAME} ---\n\n")
+        f.write(f"Duration: {elapsed / 3600:.2f} hours\n")
+        f.write(f"Requests: {totals['requests']} (Errors: {totals['errors']})\n")
+        f.write(f"Windows Retained: {len(windows)} x {WINDOW_S}s\n")
+        harness_rss = process_rss_bytes(os.getpid())
+        if harness_rss is not None:
+            f.write(f"Harness RSS at End: {harness_rss / 1e6:.0f} MB\n")
+        f.write("\n")
+
+        if baseline_means:
+            f.write(f"Baseline Latency: {sum(baseline_means) / len(baseline_means):.4f} seconds\n")
+        if len(timed) >= 2:
+            slope, intercept = linear_fit([w["start_h"] for w in timed], [w["mean_s"] for w in timed])
+            f.write(f"Latency Trend: {slope * 1000:+.2f} ms per hour (fitted start {intercept:.4f} s)\n")
+            f.write(f"Final Window Latency: mean {timed[-1]['mean_s']:.4f} s, p95 {timed[-1]['p95_s']:.4f} s\n")
+        if len(sized) >= 2:
+            slope, intercept = linear_fit([w["start_h"] for w in sized], [w["rss_mb"] for w in sized])
+            f.write(f"Server RSS Trend: {slope:+.1f} MB per hour (fitted start {intercept:.0f} MB)\n")
+        elif sized:
+            f.write(f"Server RSS: {sized[-1]['rss_mb']:.0f} MB (too few windows for a trend)\n")
+        else:
+            f.write("Server RSS: not measured (install psutil or set SERVER_PID)\n")
+
+        f.write(f"\n--- Alert Events ({len(alerts)}) ---\n")
+        for alert in alerts:
+            f.write(f"{alert}\n")
+
+    print(f"\nSoak test complete. Results saved to '{OUTPUT_FILE}'.")
+
+
+if __name__ == "__main__":
+    if USE_STUB_SERVERS:
+        from stub_ollama_server import start_stub_servers, stop_stub_servers
+        stub_servers = start_stub_servers([STUB_PORT], slowdown_per_request_s=STUB_SLOWDOWN_PER_REQUEST_S)
+        OLLAMA_BASE_URL = f"http://127.0.0.1:{STUB_PORT}"
+        # The stub runs inside this process
+        SERVER_PID = os.getpid()
+        try:
+            run_soak()
+        finally:
+            stop_stub_servers(stub_servers)
+    else:
+        run_soak()
@@ -0,0 +1,241 @@
+import re
+import json
+import time
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# --- Configuration ---
+# Ports used when this file is run directly, e.g. to stand in for several Ollama instances
+STUB_PORTS = [11501, 11502, 11503]
+HOST = "127.0.0.1"
+
+# Simulated timings, roughly matching the Llama3.2-3B-Q4_M stats on a CPU-only box
+DEFAULT_OPTIONS = {
+    "load_delay_s": 2.0,        # cost of loading a model that is not resident
+    "prompt_token_s": 0.0002,   # prompt evaluation cost per prompt token
+    "eval_token_s": 0.015,      # generation cost per output token
+    "reply_tokens": 45,         # output tokens per reply
+    "num_parallel": 1,          # requests processed at once (OLLAMA_NUM_PARALLEL)
+    "max_loaded_models": 3,     # resident models before the least recently used is unloaded
+    "model_size_bytes": 2_000_000_000,
+    "slowdown_per_request_s": 0.0  # extra latency added per request served, to mimic a degrading server
+}
+DEFAULT_KEEP_ALIVE = "5m"
+
+
+def parse_keep_alive(value):
+    """
+    Converts an Ollama keep_alive value ("5m", "30s", 300, -1, 0) into seconds.
+    Negative values mean keep the model loaded forever and are returned as None.
+    """
+    if value is None:
+        value = DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r"\s*(-?[\d.]+)\s*(ms|s|m|h)?\s*", str(value))
+        if not match:
+            return parse_keep_alive(DEFAULT_KEEP_ALIVE)
+        unit_seconds = {"ms": 0.001, "s": 1, "m": 60, "h": 3600, None: 1}[match.group(2)]
+        seconds = float(match.group(1)) * unit_seconds
+    return None if seconds < 0 else seconds
+
+
+def estimate_tokens(text):
+    """Rough token count used for the simulated prompt_eval_count."""
+    return max(1, int(len(re.findall(r"\w+|[^\w\s]", text)) * 1.1))
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """
+    A local stand-in for one Ollama instance. It answers /api/chat, /api/generate and
+    /api/ps with Ollama-shaped JSON, sleeps for simulated load and eval times, and tracks
+    which models are resident so that keep_alive and preloading behave realistically.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address, **options):
+        super().__init__(address, StubOllamaHandler)
+        self.options = dict(DEFAULT_OPTIONS, **options)
+        self.slots = threading.Semaphore(self.options["num_parallel"])
+        self.models_lock = threading.Lock()
+        self.resident = {}  # model name -> expiry time (None = never), in insertion/LRU order
+        self.request_count = 0
+
+    def _expire_models(self, now):
+        for name, expires_at in list(self.resident.items()):
+            if expires_at is not None and expires_at <= now:
+                del self.resident[name]
+
+    def ensure_loaded(self, model):
+        """Loads model if needed and returns the simulated load duration in seconds."""
+        with self.models_lock:
+            now = time.monotonic()
+            self._expire_models(now)
+            if model in self.resident:
+                # Refresh LRU position
+                self.resident[model] = self.resident.pop(model)
+                return 0.0
+        load_delay = self.options["load_delay_s"]
+        time.sleep(load_delay)
+        with self.models_lock:
+            self.resident[model] = None
+            while len(self.resident) > self.options["max_loaded_models"]:
+                del self.resident[next(iter(self.resident))]
+        return load_delay
+
+    def release(self, model, keep_alive):
+        """Applies keep_alive once a request finishes."""
+        seconds = parse_keep_alive(keep_alive)
+        with self.models_lock:
+            if model not in self.resident:
+                return
+            if seconds == 0:
+                del self.resident[model]
+            else:
+                self.resident[model] = None if seconds is None else time.monotonic() + seconds
+
+    def running_models(self):
+        """Returns the /api/ps view of resident models."""
+        with self.models_lock:
+            now = time.monotonic()
+            self._expire_models(now)
+            models = []
+            for name, expires_at in self.resident.items():
+                if expires_at is None:
+                    expires = "2318-01-01T00:00:00Z"
+                else:
+                    expires = datetime.fromtimestamp(time.time() + expires_at - now, timezone.utc).isoformat()
+                models.append({
+                    "name": name,
+                    "model": name,
+                    "size": self.options["model_size_bytes"],
+                    "size_vram": 0,
+                    "expires_at": expires
+                })
+            return models
+
+
+class StubOllamaHandler(BaseHTTPRequestHandler):
+    """Request handler for StubOllamaServer."""
+
+    def log_message(self, format, *args):
+        pass  # Keep benchmark output readable
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/api/ps":
+            self._send_json(200, {"models": self.server.running_models()})
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": "invalid JSON body"})
+            return
+
+        if self.path == "/api/chat":
+            messages = request.get("messages") or []
+            prompt = messages[-1].get("content", "") if messages else ""
+        elif self.path == "/api/generate":
+            prompt = request.get("prompt", "")
+        else:
+            self._send_json(404, {"error": "not found"})
+            return
+
+        model = request.get("model", "")
+        if not model:
+            self._send_json(400, {"error": "model is required"})
+            return
+
+        self._send_json(200, self._run(model, prompt, request.get("keep_alive")))
+
+    def _run(self, model, prompt, keep_alive):
+        server = self.server
+        options = server.options
+        start_time = time.perf_counter()
+
+        with server.slots:
+            with server.models_lock:
+                server.request_count += 1
+            # An empty prompt with keep_alive 0 is Ollama's unload request
+            if not prompt and parse_keep_alive(keep_alive) == 0:
+                server.release(model, 0)
+                return {"model": model, "created_at": _now_iso(), "done_reason": "unload", "done": True}
+
+            load_duration = server.ensure_loaded(model)
+            prompt_eval_count = estimate_tokens(prompt) if prompt else 0
+            prompt_eval_duration = prompt_eval_count * options["prompt_token_s"]
+            eval_count = options["reply_tokens"] if prompt else 0
+            eval_duration = eval_count * options["eval_token_s"] + server.request_count * options["slowdown_per_request_s"]
+            time.sleep(prompt_eval_duration + eval_duration)
+            server.release(model, keep_alive)
+
+        total_duration = time.perf_counter() - start_time
+        reply = {
+            "model": model,
+            "created_at": _now_iso(),
+            "message": {"role": "assistant", "content": _stub_reply(prompt) if prompt else ""},
+            "done_reason": "stop" if prompt else "load",
+            "done": True,
+            "total_duration": int(total_duration * 1e9),
+            "load_duration": int(load_duration * 1e9),
+            "prompt_eval_count": prompt_eval_count,
+            "prompt_eval_duration": int(prompt_eval_duration * 1e9),
+            "eval_count": eval_count,
+            "eval_duration": int(eval_duration * 1e9)
+        }
+        if self.path == "/api/generate":
+            reply["response"] = reply.pop("message")["content"]
+        return reply
+
+
+def _now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _stub_reply(prompt):
+    """Echoes the required first sentence so the quality checks have something sensible to score."""
+    match = re.search(r"Sentence 1 (?:must be )?exactly:?\s*\"?(.+?)\"?\n", prompt)
+    first_sentence = match.group(1).strip() if match else "Squat summary."
+    return f"{first_sentence} Consistent technique was observed throughout the phases. <END>"
+
+
+def start_stub_servers(ports, host=HOST, **options):
+    """Starts one stub server per port in background threads and returns the servers."""
+    servers = []
+    for port in ports:
+        server = StubOllamaServer((host, port), **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers
+
+
+def stop_stub_servers(servers):
+    """Shuts down servers started with start_stub_servers()."""
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    servers = start_stub_servers(STUB_PORTS)
+    for port in STUB_PORTS:
+        print(f"Stub Ollama server listening on http://{HOST}:{port}/api/chat")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stop_stub_servers(servers)
@@ -0,0 +1,204 @@
+import os
+import glob
+import time
+import numpy as np
+import pandas as pd
+
+# --- Configuration ---
+INPUT_GLOB = "*quatData.csv"          # frame logs to audit (bigFrontSquatData.csv, squatData.csv, ...)
+OUTPUT_FILE = "angle_audit_results.txt"
+
+PHASES = ["standing", "descending", "bottom", "ascending"]
+# Worst-of-three tracking state of the joints that make up an angle
+SOURCES = ["Tracked", "Estimated", "Inferred"]
+# Angle prefix -> name used in the report
+ANGLES = {"t": "trunk", "lk": "left knee", "rk": "right knee"}
+DEG_COLUMNS = {"t": "trunk_deg", "lk": "lk_deg", "rk": "rk_deg"}
+
+# The logger writes cosines to 3 decimals and angles to 1 decimal
+COS_ROUNDING = 0.0005
+DEG_ROUNDING_RAD = np.radians(0.05)
+TOLERANCE_EPS = 1e-6
+
+
+def load_frames(filepath):
+    """Reads one frame log with categorical columns so that millions of rows stay cheap."""
+    columns = ["phase"]
+    dtypes = {"phase": "category"}
+    for prefix, deg_col in DEG_COLUMNS.items():
+        columns += [deg_col, f"{prefix}_pre", f"{prefix}_post", f"{prefix}_clamped"]
+        dtypes[f"{prefix}_clamped"] = "category"
+        for joint in "ABC":
+            columns.append(f"{prefix}_src{joint}")
+            dtypes[f"{prefix}_src{joint}"] = "category"
+    return pd.read_csv(filepath, usecols=columns, dtype=dtypes)
+
+
+def numeric(df, column):
+    """Returns a float array for column; unparseable cells (e.g. interleaved debug output) become NaN."""
+    return pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+
+
+def matches(df, column, value):
+    """Vectorized comparison on a categorical column."""
+    return (df[column] == value).to_numpy()
+
+
+def audit_angle(df, prefix):
+    """
+    Audits one angle over every frame. Returns a dict of per-frame boolean arrays plus
+    the worst tracking source code (index into SOURCES) of the angle's three joints.
+    """
+    deg = numeric(df, DEG_COLUMNS[prefix])
+    pre = numeric(df, f"{prefix}_pre")
+    post = numeric(df, f"{prefix}_post")
+    clamped_flag = matches(df, f"{prefix}_clamped", "True")
+
+    malformed = np.isnan(deg) | np.isnan(pre) | np.isnan(post)
+
+    # The clamp should be exactly clip(pre, -1, 1) and flagged whenever pre left [-1, 1]
+    clamp_needed = np.abs(pre) > 1 + COS_ROUNDING
+    post_mismatch = np.abs(post - np.clip(pre, -1, 1)) > COS_ROUNDING * 2 + TOLERANCE_EPS
+    flag_mismatch = clamped_flag != clamp_needed
+
+    # Compare in the cosine domain so the tolerance reflects both roundings
+    rad = np.radians(deg)
+    tolerance = COS_ROUNDING + DEG_ROUNDING_RAD * np.abs(np.sin(rad)) + TOLERANCE_EPS
+    angle_mismatch = np.abs(np.cos(rad) - post) > tolerance
+    recomputed_deg = np.degrees(np.arccos(np.clip(post, -1, 1)))
+
+    inferred = np.zeros(len(df), dtype=bool)
+    estimated = np.zeros(len(df), dtype=bool)
+    for joint in "ABC":
+        inferred |= matches(df, f"{prefix}_src{joint}", "Inferred")
+        estimated |= matches(df, f"{prefix}_src{joint}", "Estimated")
+    source = np.where(inferred, 2, np.where(estimated, 1, 0))
+
+    valid = ~malformed
+    return {
+        "malformed": malformed,
+        "clamped": (clamped_flag | clamp_needed) & valid,
+        "post_mismatch": post_mismatch & valid,
+        "flag_mismatch": flag_mismatch & valid,
+        "angle_mismatch": angle_mismatch & valid,
+        "max_deg_error": float(np.nanmax(np.abs(recomputed_deg - deg), initial=0)),
+        "source": source
+    }
+
+
+def phase_codes(df):
+    """Maps the phase column onto indices into PHASES (-1 for anything else)."""
+    return pd.Index(PHASES).get_indexer(df["phase"].astype(str)).astype(np.int64)
+
+
+def count_by_phase_source(mask, phases, sources):
+    """Counts True frames per (phase, source) with a single bincount."""
+    keep = mask & (phases >= 0)
+    flat = phases[keep] * len(SOURCES) + sources[keep]
+    return np.bincount(flat, minlength=len(PHASES) * len(SOURCES)).reshape(len(PHASES), len(SOURCES))
+
+
+def phi_coefficient(contingency):
+    """Phi correlation from a 2x2 table [[n00, n01], [n10, n11]]; None if a margin is empty."""
+    (n00, n01), (n10, n11) = contingency.astype(np.float64)
+    denominator = np.sqrt((n00 + n01) * (n10 + n11) * (n00 + n10) * (n01 + n11))
+    if denominator == 0:
+        return None
+    return float((n11 * n00 - n10 * n01) / denominator)
+
+
+def audit_files(filepaths):
+    """Audits every file and returns per-file row counts plus totals per angle."""
+    totals = {prefix: {} for prefix in ANGLES}
+    file_rows = []
+
+    for filepath in filepaths:
+        df = load_frames(filepath)
+        phases = phase_codes(df)
+        file_malformed = np.zeros(len(df), dtype=bool)
+
+        for prefix in ANGLES:
+            result = audit_angle(df, prefix)
+            file_malformed |= result["malformed"]
+            angle_totals = totals[prefix]
+            valid = ~result["malformed"]
+            non_tracked = result["source"] > 0
+
+            for key in ("clamped", "post_mismatch", "flag_mismatch", "angle_mismatch"):
+                counts = count_by_phase_source(result[key], phases, result["source"])
+                angle_totals[key] = angle_totals.get(key, 0) + counts
+            angle_totals["frames"] = angle_totals.get("frames", 0) + count_by_phase_source(valid, phases, result["source"])
+            angle_totals["max_deg_error"] = max(angle_totals.get("max_deg_error", 0), result["max_deg_error"])
+            # Rows: all joints Tracked / some Inferred or Estimated; columns: not clamped / clamped
+            contingency = np.bincount(
+                non_tracked[valid].astype(np.int64) * 2 + result["clamped"][valid],
+                minlength=4
+            ).reshape(2, 2)
+            angle_totals["contingency"] = angle_totals.get("contingency", 0) + contingency
+
+        file_rows.append((os.path.basename(filepath), len(df), int(file_malformed.sum())))
+
+    return file_rows, totals
+
+
+def write_table(f, title, counts, frames):
+    f.write(f"{title}\n")
+    f.write(f"{'phase':<12}" + "".join(f"{s:>22}" for s in SOURCES) + "\n")
+    for p, phase in enumerate(PHASES):
+        cells = []
+        for s in range(len(SOURCES)):
+            n = frames[p, s]
+            rate = counts[p, s] / n * 100 if n else 0
+            cells.append(f"{counts[p, s]:>8} / {n:<7}({rate:5.1f}%)")
+        f.write(f"{phase:<12}" + "".join(f"{c:>22}" for c in cells) + "\n")
+    f.write("\n")
+
+
+def main():
+    """Runs the audit over every matching frame log and writes the report."""
+    filepaths = sorted(glob.glob(INPUT_GLOB))
+    if not filepaths:
+        print(f"Error: No frame logs match '{INPUT_GLOB}'.")
+        return
+
+    start_time = time.perf_counter()
+    file_rows, totals = audit_files(filepaths)
+    elapsed = time.perf_counter() - start_time
+    total_frames = sum(rows for _, rows, _ in file_rows)
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        f.write("--- Joint Angle and Clamp Audit ---\n\n")
+        for name, rows, malformed in file_rows:
+            f.write(f"{name}: {rows} frames, {malformed} malformed\n")
+        f.write(f"\nTotal: {total_frames} frames in {elapsed:.2f} seconds "
+                f"({total_frames / elapsed if elapsed > 0 else 0:,.0f} frames/s)\n\n")
+
+        for prefix, angle_name in ANGLES.items():
+            t = totals[prefix]
+            frames = t["frames"]
+            f.write("=========================================\n")
+            f.write(f"Angle: {angle_name} ({DEG_COLUMNS[prefix]})\n")
+            f.write("=========================================\n\n")
+            f.write(f"Valid frames: {frames.sum()}\n")
+            f.write(f"Angle inconsistent with {prefix}_post: {t['angle_mismatch'].sum()}\n")
+            f.write(f"{prefix}_post not equal to clip({prefix}_pre): {t['post_mismatch'].sum()}\n")
+            f.write(f"{prefix}_clamped flag disagrees with {prefix}_pre: {t['flag_mismatch'].sum()}\n")
+            f.write(f"Clamped frames: {t['clamped'].sum()}\n")
+            f.write(f"Max |recomputed - logged| angle: {t['max_deg_error']:.2f} deg\n\n")
+
+            write_table(f, "Clamped frames by phase and tracking source:", t["clamped"], frames)
+            write_table(f, "Inconsistent angles by phase and tracking source:", t["angle_mismatch"], frames)
+
+            contingency = t["contingency"]
+            tracked_rate = contingency[0, 1] / contingency[0].sum() * 100 if contingency[0].sum() else 0
+            other_rate = contingency[1, 1] / contingency[1].sum() * 100 if contingency[1].sum() else 0
+            phi = phi_coefficient(contingency)
+            f.write("Clamping vs Inferred/Estimated joints:\n")
+            f.write(f"- Clamp rate when all joints Tracked: {tracked_rate:.2f}%\n")
+            f.write(f"- Clamp rate with an Inferred/Estimated joint: {other_rate:.2f}%\n")
+            f.write(f"- Phi correlation: {'n/a (a variable is constant)' if phi is None else f'{phi:.3f}'}\n\n")
+
+    print(f"Audited {total_frames} frames from {len(filepaths)} files in {elapsed:.2f}s. Results saved to '{OUTPUT_FILE}'.")
+
+if __name__ == "__main__":
+    main()
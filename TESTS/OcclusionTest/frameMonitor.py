@@ -0,0 +1,263 @@
+import os
+import csv
+import time
+from collections import deque
+from datetime import datetime
+
+# --- Configuration ---
+INPUT_FILE = "squatData.csv"          # frame log the Kinect app is writing
+LOG_FILE = "frame_monitor_log.txt"    # alerts and summaries, appended as the monitor runs
+FROM_START = True                     # False = skip rows already in the file, like tail -f
+POLL_INTERVAL_S = 0.2                 # wait between reads once the end of the file is reached
+IDLE_TIMEOUT_S = None                 # stop after this long without new rows (None = run until Ctrl+C)
+
+# Each phase keeps its own window of its most recent frames, so short phases (descending can
+# last only a few frames per rep) build up enough samples over several reps to be judged
+WINDOW_FRAMES = 90                    # per phase, ~3 s of that phase at the Kinect's 30 fps
+SUMMARY_EVERY_FRAMES = 900            # write a per-phase summary every N frames
+# Alert when the share of a phase's window frames with an Inferred or Estimated joint in a
+# joint group reaches this, and clear it once the share falls below ALERT_CLEAR_RATIO of it
+ALERT_THRESHOLD = 0.30
+ALERT_CLEAR_RATIO = 0.8
+# A phase is not judged until its window holds this many frames. Descending and ascending are
+# short (the bundled logs have 1-9 descending frames per rep and 10-26 per session), so they need less
+MIN_FRAMES_FOR_ALERT = {"standing": 30, "descending": 8, "bottom": 30, "ascending": 8}
+
+# Same definitions as fypOcculusion.py, split per joint group
+phase_order = ["standing", "descending", "bottom", "ascending"]
+JOINT_GROUPS = {
+    "trunk": ["t_srcA", "t_srcB", "t_srcC"],
+    "left knee": ["lk_srcA", "lk_srcB", "lk_srcC"],
+    "right knee": ["rk_srcA", "rk_srcB", "rk_srcC"],
+}
+GROUP_NAMES = list(JOINT_GROUPS)
+
+
+class SlidingWindow:
+    """
+    The last WINDOW_FRAMES frames of each phase with running counts per joint group, so
+    each new frame costs O(1) and memory stays fixed however long the session runs.
+    """
+
+    def __init__(self, size):
+        self.frames = [deque(maxlen=size) for _ in phase_order]
+        # counts[phase][group] = [frames, frames with an Inferred joint, frames with an Estimated joint,
+        #                         frames with either]
+        self.counts = [[[0, 0, 0, 0] for _ in GROUP_NAMES] for _ in phase_order]
+
+    def add(self, phase, flags):
+        """flags holds one (any_inferred, any_estimated) pair per joint group."""
+        frames = self.frames[phase]
+        if len(frames) == frames.maxlen:
+            self._update(phase, frames[0], -1)
+        frames.append(flags)
+        self._update(phase, flags, 1)
+
+    def _update(self, phase, flags, sign):
+        for counts, (inferred, estimated) in zip(self.counts[phase], flags):
+            counts[0] += sign
+            counts[1] += sign * inferred
+            counts[2] += sign * estimated
+            counts[3] += sign * (inferred | estimated)
+
+    def shares(self, phase, group):
+        """Returns (frames, inferred share, estimated share) for one phase and joint group."""
+        frames, inferred, estimated, _ = self.counts[phase][group]
+        if frames == 0:
+            return 0, 0.0, 0.0
+        return frames, inferred / frames, estimated / frames
+
+    def poor_share(self, phase, group):
+        """Share of the phase's frames where the group had an Inferred or Estimated joint."""
+        frames, _, _, poor = self.counts[phase][group]
+        return frames, poor / frames if frames else 0.0
+
+
+class FrameLogTail:
+    """
+    Follows a growing CSV. Only complete lines are returned; a partial last line is kept
+    until the writer finishes it. A file that shrinks (new session) is read from the start.
+    """
+
+    def __init__(self, filepath, from_start=True):
+        self.filepath = filepath
+        self.from_start = from_start
+        self.file = None
+        self.pending = ""
+        self.columns = None
+
+    def _open(self):
+        if not os.path.exists(self.filepath):
+            return False
+        self.file = open(self.filepath, 'r', encoding='utf-8', errors='replace', newline='')
+        self.pending = ""
+        self.columns = None
+        return True
+
+    def restarted(self):
+        """True (and reopens) if the file was truncated or replaced since the last read."""
+        if self.file is None:
+            return False
+        try:
+            size = os.path.getsize(self.filepath)
+        except OSError:
+            return False
+        if size < self.file.tell():
+            self.file.close()
+            self.from_start = True
+            return self._open()
+        return False
+
+    def read_rows(self):
+        """Yields each new complete row as a dict of column -> value (None for a malformed row)."""
+        if self.file is None:
+            if not self._open():
+                return
+            if not self.from_start:
+                header = self.file.readline()
+                if not header.endswith("\n"):
+                    # Header not written yet; try again on the next poll
+                    self.file.close()
+                    self.file = None
+                    return
+                self.columns = [v.strip() for v in next(csv.reader([header]))]
+                self.file.seek(0, os.SEEK_END)
+
+        while True:
+            line = self.file.readline()
+            if not line:
+                return
+            if not line.endswith("\n"):
+                self.pending += line
+                return
+            line, self.pending = self.pending + line, ""
+
+            values = next(csv.reader([line]), [])
+            if self.columns is None:
+                self.columns = [v.strip() for v in values]
+                continue
+            if len(values) != len(self.columns):
+                # e.g. a row broken by interleaved debug output
+                yield None
+                continue
+            yield dict(zip(self.columns, values))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+
+
+def frame_flags(row):
+    """Returns (phase index, per-group (any_inferred, any_estimated)), or None if the row is unusable."""
+    phase = row["phase"].strip()
+    if phase not in phase_order:
+        return None
+    flags = []
+    for columns in JOINT_GROUPS.values():
+        sources = [row.get(c, "").strip() for c in columns]
+        flags.append((int("Inferred" in sources), int("Estimated" in sources)))
+    return phase_order.index(phase), tuple(flags)
+
+
+def check_alerts(window, active, p, frame):
+    """
+    Raises and clears the alerts of phase p, the only phase whose window just changed.
+    A phase is judged once its window holds MIN_FRAMES_FOR_ALERT[phase] frames: 8 for
+    descending/ascending (about a quarter second at 30 fps, reached after 2-5 reps in the bundled
+    logs) and 30 for standing/bottom. Shorter phase samples are never judged.
+    Returns the messages to report.
+    """
+    messages = []
+    phase = phase_order[p]
+    for g, group in enumerate(GROUP_NAMES):
+        frames, poor = window.poor_share(p, g)
+        if frames < MIN_FRAMES_FOR_ALERT[phase]:
+            continue
+        if (p, g) not in active:
+            if poor >= ALERT_THRESHOLD:
+                active.add((p, g))
+                _, inferred, estimated = window.shares(p, g)
+                messages.append(f"ALERT frame {frame}: {group} poorly tracked during {phase} - "
+                                f"{poor * 100:.0f}% of last {frames} {phase} frames "
+                                f"(inferred {inferred * 100:.0f}%, estimated {estimated * 100:.0f}%). "
+                                "Check the sensor position.")
+        elif poor < ALERT_THRESHOLD * ALERT_CLEAR_RATIO:
+            active.discard((p, g))
+            messages.append(f"RECOVERED frame {frame}: {group} during {phase} back to {poor * 100:.0f}%")
+    return messages
+
+
+def summary_lines(window, frame, totals):
+    """One line per phase with the window's inferred/estimated share of every joint group."""
+    lines = [f"--- Summary at frame {frame} (last {WINDOW_FRAMES} frames per phase, "
+             f"{totals['frames']} total, {totals['malformed']} malformed rows skipped) ---"]
+    for p, phase in enumerate(phase_order):
+        frames = window.counts[p][0][0]
+        if frames == 0:
+            lines.append(f"  {phase:<11}: no frames")
+            continue
+        parts = []
+        for g, group in enumerate(GROUP_NAMES):
+            _, inferred, estimated = window.shares(p, g)
+            parts.append(f"{group} inf {inferred * 100:3.0f}% est {estimated * 100:3.0f}%")
+        lines.append(f"  {phase:<11}: {frames:4d} frames | " + " | ".join(parts))
+    return lines
+
+
+def monitor():
+    """Tails INPUT_FILE until interrupted (or idle for IDLE_TIMEOUT_S), reporting tracking quality."""
+    tail = FrameLogTail(INPUT_FILE, FROM_START)
+    window = SlidingWindow(WINDOW_FRAMES)
+    active = set()
+    totals = {"frames": 0, "malformed": 0}
+    last_frame = 0
+    last_data = time.monotonic()
+
+    print(f"Monitoring '{INPUT_FILE}' ({WINDOW_FRAMES}-frame window per phase, alert at {ALERT_THRESHOLD * 100:.0f}% "
+          f"poorly tracked). Press Ctrl+C to stop.")
+    with open(LOG_FILE, 'a', encoding='utf-8') as log:
+        def report(lines):
+            for line in lines:
+                print(line)
+                log.write(line + "\n")
+            log.flush()
+
+        report([f"--- Monitor started {datetime.now().isoformat(timespec='seconds')} on {INPUT_FILE} ---"])
+        try:
+            while True:
+                if tail.restarted():
+                    report([f"--- {INPUT_FILE} was restarted; resetting the window ---"])
+                    window = SlidingWindow(WINDOW_FRAMES)
+                    active = set()
+
+                got_rows = False
+                for row in tail.read_rows():
+                    got_rows = True
+                    parsed = frame_flags(row) if row is not None else None
+                    if parsed is None:
+                        totals["malformed"] += 1
+                        continue
+                    window.add(*parsed)
+                    totals["frames"] += 1
+                    last_frame = row["frame"].strip()
+
+                    report(check_alerts(window, active, parsed[0], last_frame))
+                    if totals["frames"] % SUMMARY_EVERY_FRAMES == 0:
+                        report(summary_lines(window, last_frame, totals))
+
+                now = time.monotonic()
+                if got_rows:
+                    last_data = now
+                elif IDLE_TIMEOUT_S is not None and now - last_data >= IDLE_TIMEOUT_S:
+                    report([f"No new frames for {IDLE_TIMEOUT_S}s; stopping."])
+                    break
+                if not got_rows:
+                    time.sleep(POLL_INTERVAL_S)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            tail.close()
+            report(summary_lines(window, last_frame, totals))
+
+if __name__ == "__main__":
+    monitor()
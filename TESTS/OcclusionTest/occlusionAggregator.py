@@ -0,0 +1,229 @@
+import os
+import json
+import glob
+import hashlib
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+# --- Configuration ---
+INPUT_DIR = "."                       # directory of frame logs, one CSV per session
+INPUT_PATTERN = "*.csv"
+CACHE_DIR = ".occlusion_cache"        # per-file partial aggregates, keyed by file hash
+OUTPUT_PREFIX = "fleet"               # writes fleetFrontOcclusionGraph.png, fleetSideOcclusionGraph.png
+MAX_WORKERS = None                    # None = one worker per CPU
+
+# View is taken from the file name, e.g. bigFrontSquatData.csv -> front
+VIEWS = ["front", "side"]
+# View for frame logs whose name names none (e.g. squatData.csv); None = leave them out
+DEFAULT_VIEW = None
+
+# Same definitions as fypOcculusion.py
+src_cols = [
+    "t_srcA","t_srcB","t_srcC",
+    "lk_srcA","lk_srcB","lk_srcC",
+    "rk_srcA","rk_srcB","rk_srcC"
+]
+phase_order = ["standing", "descending", "bottom", "ascending"]
+bin_size = 100
+
+# Bump when the partial aggregate format or its definitions change, so old cache entries are ignored
+CACHE_VERSION = 1
+
+
+def file_view(filepath):
+    """Returns the camera view named in the file name, or DEFAULT_VIEW if it has none."""
+    name = os.path.basename(filepath).lower()
+    for view in VIEWS:
+        if view in name:
+            return view
+    return DEFAULT_VIEW
+
+
+def file_hash(filepath):
+    """SHA-256 of the file contents."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cache_path(digest):
+    return os.path.join(CACHE_DIR, f"{digest}.json")
+
+
+def summarize_file(filepath):
+    """
+    Computes the partial aggregate for one frame log: for every (phase, frame_bin),
+    the number of frames and how many had any Inferred / any Estimated joint.
+    """
+    df = pd.read_csv(filepath, usecols=["frame", "phase"] + src_cols, dtype=str)
+    # Drop rows broken by interleaved debug output
+    df["frame"] = pd.to_numeric(df["frame"], errors="coerce")
+    phases = pd.Index(phase_order).get_indexer(df["phase"].str.strip())
+    keep = (phases >= 0) & df["frame"].notna().to_numpy()
+    df = df[keep]
+    phases = phases[keep]
+
+    sources = df[src_cols].apply(lambda c: c.str.strip()).to_numpy()
+    any_inferred = (sources == "Inferred").any(axis=1)
+    any_estimated = (sources == "Estimated").any(axis=1)
+    frame_bins = (df["frame"].to_numpy(dtype=np.int64) // bin_size) * bin_size
+
+    grouped = pd.DataFrame({
+        "phase": phases,
+        "frame_bin": frame_bins,
+        "n": 1,
+        "inferred": any_inferred.astype(np.int64),
+        "estimated": any_estimated.astype(np.int64)
+    }).groupby(["phase", "frame_bin"]).sum().reset_index()
+
+    return {
+        "version": CACHE_VERSION,
+        "bin_size": bin_size,
+        "counts": [
+            [phase_order[row.phase], int(row.frame_bin), int(row.n), int(row.inferred), int(row.estimated)]
+            for row in grouped.itertuples(index=False)
+        ]
+    }
+
+
+def try_summarize_file(filepath):
+    """summarize_file() for the worker pool: returns (summary, None), or (None, error) for a file that is not a frame log."""
+    try:
+        return summarize_file(filepath), None
+    except (ValueError, OSError) as e:
+        return None, str(e)
+
+
+def load_cached(digest):
+    """Returns the cached partial aggregate for a file hash, or None if missing or stale."""
+    path = cache_path(digest)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            summary = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+    if summary.get("version") != CACHE_VERSION or summary.get("bin_size") != bin_size:
+        return None
+    return summary
+
+
+def store_cached(digest, summary):
+    # Write then rename so an interrupted run never leaves a half-written entry
+    path = cache_path(digest)
+    with open(path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump(summary, f)
+    os.replace(path + ".tmp", path)
+
+
+def collect_summaries(filepaths):
+    """Loads cached partial aggregates and computes the missing ones in parallel."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    summaries = {}
+    stale = {}
+    for filepath in filepaths:
+        digest = file_hash(filepath)
+        cached = load_cached(digest)
+        if cached is not None:
+            summaries[filepath] = cached
+        else:
+            stale[filepath] = digest
+
+    if stale:
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            for filepath, (summary, error) in zip(stale, pool.map(try_summarize_file, stale)):
+                if error is not None:
+                    print(f"Warning: Skipping '{filepath}': {error}")
+                    continue
+                store_cached(stale[filepath], summary)
+                summaries[filepath] = summary
+
+    return summaries, sum(1 for filepath in stale if filepath in summaries)
+
+
+def merge_summaries(summaries):
+    """Sums the per-file counts into one (phase, frame_bin) table per view."""
+    rows = []
+    for filepath, summary in summaries.items():
+        view = file_view(filepath)
+        for phase, frame_bin, n, inferred, estimated in summary["counts"]:
+            rows.append((view, phase, frame_bin, n, inferred, estimated))
+
+    merged = pd.DataFrame(rows, columns=["view", "phase", "frame_bin", "n", "inferred", "estimated"])
+    return merged.groupby(["view", "phase", "frame_bin"], as_index=False).sum()
+
+
+def plot_view(merged, view, num_sessions):
+    """Draws the inferred/estimated share heatmaps for one view, laid out as in fypOcculusion.py."""
+    agg = merged[merged["view"] == view].copy()
+    if agg.empty:
+        print(f"No {view} view sessions found.")
+        return
+    agg["inferred_share"] = agg["inferred"] / agg["n"]
+    agg["estimated_share"] = agg["estimated"] / agg["n"]
+
+    inferred_piv = agg.pivot(index="phase", columns="frame_bin", values="inferred_share").reindex(index=phase_order)
+    estimated_piv = agg.pivot(index="phase", columns="frame_bin", values="estimated_share").reindex(index=phase_order)
+
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5), sharey=True)
+
+    im0 = axes[0].imshow(inferred_piv.values, aspect="auto", cmap="Reds", vmin=0, vmax=1, interpolation="nearest")
+    axes[0].set_title(f"Inferred share by phase and time ({view} view, {num_sessions} sessions)")
+    axes[0].set_yticks(range(len(phase_order)))
+    axes[0].set_yticklabels(phase_order)
+    axes[0].set_xticks(range(len(inferred_piv.columns)))
+    axes[0].set_xticklabels(inferred_piv.columns, rotation=45, ha="right")
+    axes[0].set_xlabel(f"Frame bin (size={bin_size})")
+    axes[0].set_ylabel("Phase")
+
+    im1 = axes[1].imshow(estimated_piv.values, aspect="auto", cmap="Oranges", vmin=0, vmax=1, interpolation="nearest")
+    axes[1].set_title(f"Estimated share by phase and time ({view} view, {num_sessions} sessions)")
+    axes[1].set_xticks(range(len(estimated_piv.columns)))
+    axes[1].set_xticklabels(estimated_piv.columns, rotation=45, ha="right")
+    axes[1].set_xlabel(f"Frame bin (size={bin_size})")
+
+    cbar0 = fig.colorbar(im0, ax=axes[0], fraction=0.046, pad=0.04)
+    cbar0.set_label("Share (0..1)")
+    cbar1 = fig.colorbar(im1, ax=axes[1], fraction=0.046, pad=0.04)
+    cbar1.set_label("Share (0..1)")
+
+    plt.tight_layout()
+    output_file = f"{OUTPUT_PREFIX}{view.capitalize()}OcclusionGraph.png"
+    plt.savefig(output_file)
+    plt.close(fig)
+    print(f"Saved: {output_file}")
+
+
+def main():
+    filepaths = sorted(glob.glob(os.path.join(INPUT_DIR, INPUT_PATTERN)))
+    excluded = [filepath for filepath in filepaths if file_view(filepath) is None]
+    if excluded:
+        print(f"Excluded (no view in file name, set DEFAULT_VIEW to include): "
+              f"{', '.join(os.path.basename(filepath) for filepath in excluded)}")
+    filepaths = [filepath for filepath in filepaths if filepath not in excluded]
+    if not filepaths:
+        print(f"Error: No frame logs found in '{INPUT_DIR}'.")
+        return
+
+    start_time = time.perf_counter()
+    summaries, num_computed = collect_summaries(filepaths)
+    merged = merge_summaries(summaries)
+    elapsed = time.perf_counter() - start_time
+    print(f"{len(summaries)} frame logs: {num_computed} processed, {len(summaries) - num_computed} from cache "
+          f"({elapsed:.2f}s).")
+
+    for view in VIEWS:
+        num_sessions = sum(1 for filepath in summaries if file_view(filepath) == view)
+        plot_view(merged, view, num_sessions)
+
+if __name__ == "__main__":
+    main()